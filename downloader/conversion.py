@@ -1,10 +1,33 @@
 from __future__ import annotations
 
+import re
+from functools import lru_cache
+
 try:
     from opencc import OpenCC
 except Exception:
     OpenCC = None
 
+# 章节标题、书名等短文本在一本书里大量重复，缓存其转换结果；正文等长文本不进缓存。
+_CACHE_MAX_TEXT_LEN = 256
+
+# 常用的繁体专用字（简体中不会出现）。繁体正文几乎必然包含其中若干字，
+# 长文本一个都没有时可视为已是简体，直接跳过 OpenCC 的逐字/逐词查表
+_TRADITIONAL_ONLY_CHARS = (
+    "這們說個來時會為學國對後從還樣過發現實問題間關體麼點應當機電話東車長開門見語經沒讓種員動頭進與興"
+    "義書氣無邊條專業產區醫戰歷記愛親聽幾幫寫錢買賣將處務雖聲總嗎歡樂認識讀萬離難變飛鳥馬魚龍龜園圖團"
+    "際隊陽陰險響頁順須領風飯館傳價儘兒兩內冊寶導屬島師帶廣張彈歸徑復戀態戲戶拋據擇擔擊擬損換揮攝數斷"
+    "於畫樓標權歲殺漢滿潔煙熱燈爭爺牆獨環畢異療盡監盤眾睜禮稅穩窮競筆節範築簡糧紀約紅級純紙細終組結絕"
+    "給統絲綠網緊線編練縣績織繼續纖罰羅習聖聞聯職肅腦腳臉臨舉艦藝蘭號蟲術衛裝裡製複規視覺觀計訂討訓訪"
+    "設許論詩該誤請談謝證護讚貝負財貨質購賽趕趙軍輕輪輸辦農連運達遠適選遺郵鄉釋針鐘鋼錯鍵閉閱陣陳隨隱"
+    "雜雞靈靜韓頂項頓預顏願類顯飲驗驚髮鬆鬥鬧麗麥黃齊齒"
+)
+_TRADITIONAL_ONLY_RE = re.compile(f"[{_TRADITIONAL_ONLY_CHARS}]")
+
+
+def is_traditional(text: str) -> bool:
+    return _TRADITIONAL_ONLY_RE.search(text) is not None
+
 
 class OpenCCConverter:
     def __init__(self) -> None:
@@ -14,15 +37,24 @@ class OpenCCConverter:
                 self._converter = OpenCC("t2s")
             except Exception:
                 self._converter = None
+        self._cached_convert = lru_cache(maxsize=8192)(self._convert_uncached)
 
     @property
     def available(self) -> bool:
         return self._converter is not None
 
+    def _convert_uncached(self, text: str) -> str:
+        return self._converter.convert(text)
+
     def convert(self, text: str) -> str:
-        if not self._converter:
+        if not self._converter or text.isascii():
             return text
-        return self._converter.convert(text)
+        if len(text) <= _CACHE_MAX_TEXT_LEN:
+            return self._cached_convert(text)
+        # 短文本可能恰好不含上面的字（如单字标题），只对长文本做预判
+        if not is_traditional(text):
+            return text
+        return self._convert_uncached(text)
 
 
 OPENCC = OpenCCConverter()
@@ -1,98 +1,58 @@
 from __future__ import annotations
 
 import html
+import io
 import re
 import uuid
 import zipfile
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO, Iterable
 
 from .models import ChapterContent, NovelMeta
 
 RUBY_TOKEN_RE = re.compile(r"⟦RUBY:(.*?)\|(.*?)⟧")
 
+# JPEG/PNG/WebP 本身已压缩，再做 DEFLATE 只会白耗 CPU，直接 STORED 写入。
+PRECOMPRESSED_MEDIA_TYPES = frozenset({"image/jpeg", "image/png", "image/webp", "image/gif"})
+# 文本条目默认用最快的压缩级别；需要更小的文件时可调高（9 为最小体积）
+TEXT_COMPRESSLEVEL = 1
 
-def _render_text_with_ruby(text: str) -> str:
-    parts: list[str] = []
-    cursor = 0
-    for match in RUBY_TOKEN_RE.finditer(text):
-        start, end = match.span()
-        if start > cursor:
-            parts.append(html.escape(text[cursor:start]))
-        base = html.escape(match.group(1))
-        annotation = html.escape(match.group(2))
-        parts.append(f"<ruby>{base}<rt>{annotation}</rt></ruby>")
-        cursor = end
-    if cursor < len(text):
-        parts.append(html.escape(text[cursor:]))
-    return "".join(parts)
-
-
-def to_xhtml_paragraphs(text: str) -> str:
-    lines = [line.strip() for line in text.splitlines()]
-    paragraphs = [line for line in lines if line]
-    if not paragraphs:
-        return "<p></p>"
-    return "\n".join(f"<p>{_render_text_with_ruby(p)}</p>" for p in paragraphs)
-
-
-def build_epub(
-    output_file: Path,
-    meta: NovelMeta,
-    chapters: list[ChapterContent],
-    cover_bytes: bytes | None,
-    cover_media_type: str | None,
-    cover_name: str | None,
-) -> None:
-    book_id = f"urn:uuid:{uuid.uuid4()}"
-    now_iso = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
-
-    manifest_items = [
-        '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>',
-        '<item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>',
-    ]
-    spine_items: list[str] = []
-    nav_points: list[str] = []
-    nav_links: list[str] = []
-
-    if cover_bytes and cover_media_type and cover_name:
-        manifest_items.append(
-            f'<item id="cover-image" href="images/{cover_name}" media-type="{cover_media_type}" properties="cover-image"/>'
-        )
-        manifest_items.append('<item id="cover-page" href="cover.xhtml" media-type="application/xhtml+xml"/>')
-        spine_items.append('<itemref idref="cover-page"/>')
-
-    for idx, chapter in enumerate(chapters, start=1):
-        manifest_items.append(f'<item id="chap{idx}" href="text/chapter{idx}.xhtml" media-type="application/xhtml+xml"/>')
-        spine_items.append(f'<itemref idref="chap{idx}"/>')
-        nav_points.append(
-            f'''<navPoint id="navPoint-{idx}" playOrder="{idx}">
-      <navLabel><text>{html.escape(chapter.title)}</text></navLabel>
+MANIFEST_ITEM_TMPL = '<item id="chap{idx}" href="text/chapter{idx}.xhtml" media-type="application/xhtml+xml"/>'
+SPINE_ITEM_TMPL = '<itemref idref="chap{idx}"/>'
+NAV_POINT_TMPL = '''<navPoint id="navPoint-{idx}" playOrder="{idx}">
+      <navLabel><text>{title}</text></navLabel>
       <content src="text/chapter{idx}.xhtml"/>
     </navPoint>'''
-        )
-        nav_links.append(f'<li><a href="text/chapter{idx}.xhtml">{html.escape(chapter.title)}</a></li>')
-
-    opf = f'''<?xml version="1.0" encoding="UTF-8"?>
+NAV_LINK_TMPL = '<li><a href="text/chapter{idx}.xhtml">{title}</a></li>'
+MIMETYPE_BYTES = b"application/epub+zip"
+CONTAINER_XML_BYTES = b"""<?xml version="1.0" encoding="UTF-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>
+"""
+OPF_TMPL = '''<?xml version="1.0" encoding="UTF-8"?>
 <package xmlns="http://www.idpf.org/2007/opf" unique-identifier="bookid" version="3.0">
   <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
     <dc:identifier id="bookid">{book_id}</dc:identifier>
-    <dc:title>{html.escape(meta.title)}</dc:title>
-    <dc:creator>{html.escape(meta.author)}</dc:creator>
-    <dc:language>{meta.language}</dc:language>
+    <dc:title>{title}</dc:title>
+    <dc:creator>{author}</dc:creator>
+    <dc:language>{language}</dc:language>
     <dc:date>{now_iso}</dc:date>
     <meta property="dcterms:modified">{now_iso}</meta>
   </metadata>
   <manifest>
-    {''.join(manifest_items)}
+    {manifest}
   </manifest>
   <spine toc="ncx">
-    {''.join(spine_items)}
+    {spine}
   </spine>
 </package>
 '''
-
-    toc_ncx = f'''<?xml version="1.0" encoding="UTF-8"?>
+TOC_NCX_TMPL = '''<?xml version="1.0" encoding="UTF-8"?>
 <ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">
   <head>
     <meta name="dtb:uid" content="{book_id}"/>
@@ -100,45 +60,26 @@ def build_epub(
     <meta name="dtb:totalPageCount" content="0"/>
     <meta name="dtb:maxPageNumber" content="0"/>
   </head>
-  <docTitle><text>{html.escape(meta.title)}</text></docTitle>
+  <docTitle><text>{title}</text></docTitle>
   <navMap>
-    {''.join(nav_points)}
+    {nav_points}
   </navMap>
 </ncx>
 '''
-
-    nav_xhtml = f'''<?xml version="1.0" encoding="UTF-8"?>
+NAV_XHTML_TMPL = '''<?xml version="1.0" encoding="UTF-8"?>
 <html xmlns="http://www.w3.org/1999/xhtml" lang="zh-Hant">
 <head><title>目录</title></head>
 <body>
   <nav epub:type="toc" xmlns:epub="http://www.idpf.org/2007/ops">
-    <h1>{html.escape(meta.title)}</h1>
+    <h1>{title}</h1>
     <ol>
-      {''.join(nav_links)}
+      {nav_links}
     </ol>
   </nav>
 </body>
 </html>
 '''
-
-    with zipfile.ZipFile(output_file, "w") as zf:
-        zf.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
-        zf.writestr(
-            "META-INF/container.xml",
-            """<?xml version=\"1.0\" encoding=\"UTF-8\"?>
-<container version=\"1.0\" xmlns=\"urn:oasis:names:tc:opendocument:xmlns:container\">
-  <rootfiles>
-    <rootfile full-path=\"OEBPS/content.opf\" media-type=\"application/oebps-package+xml\"/>
-  </rootfiles>
-</container>
-""",
-        )
-        zf.writestr("OEBPS/content.opf", opf)
-        zf.writestr("OEBPS/toc.ncx", toc_ncx)
-        zf.writestr("OEBPS/nav.xhtml", nav_xhtml)
-
-        if cover_bytes and cover_media_type and cover_name:
-            cover_page = f'''<?xml version="1.0" encoding="UTF-8"?>
+COVER_XHTML_TMPL = '''<?xml version="1.0" encoding="UTF-8"?>
 <html xmlns="http://www.w3.org/1999/xhtml">
 <head><title>封面</title></head>
 <body>
@@ -148,17 +89,105 @@ def build_epub(
 </body>
 </html>
 '''
-            zf.writestr("OEBPS/cover.xhtml", cover_page)
-            zf.writestr(f"OEBPS/images/{cover_name}", cover_bytes)
-
-        for idx, chapter in enumerate(chapters, start=1):
-            chapter_xhtml = f'''<?xml version="1.0" encoding="UTF-8"?>
+CHAPTER_XHTML_TMPL = '''<?xml version="1.0" encoding="UTF-8"?>
 <html xmlns="http://www.w3.org/1999/xhtml" lang="zh-Hant">
-<head><title>{html.escape(chapter.title)}</title></head>
+<head><title>{title}</title></head>
 <body>
-  <h1>{html.escape(chapter.title)}</h1>
-  {to_xhtml_paragraphs(chapter.content)}
+  <h1>{title}</h1>
+  {body}
 </body>
 </html>
 '''
+
+
+# 章节标题常有大量重复（如“番外”“后记”），且同一进程内会多次导出同一本书，缓存转义结果
+_escape_title = lru_cache(maxsize=4096)(html.escape)
+
+
+def to_xhtml_paragraphs(text: str) -> str:
+    # html.escape 不会改动换行和 ⟦RUBY:…|…⟧ 标记本身，且标记正则不跨行匹配，
+    # 因此整章先转义、拼好段落后再统一替换标记，与逐行处理结果一致，只需两次 C 层扫描。
+    body = "\n".join([f"<p>{line}</p>" for raw in html.escape(text).splitlines() if (line := raw.strip())])
+    return RUBY_TOKEN_RE.sub(r"<ruby>\1<rt>\2</rt></ruby>", body) or "<p></p>"
+
+
+def build_epub(
+    output_file: Path | BinaryIO,
+    meta: NovelMeta,
+    chapters: Iterable[ChapterContent],
+    cover_bytes: bytes | None,
+    cover_media_type: str | None,
+    cover_name: str | None,
+    compresslevel: int = TEXT_COMPRESSLEVEL,
+) -> None:
+    book_id = f"urn:uuid:{uuid.uuid4()}"
+    now_iso = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    has_cover = bool(cover_bytes and cover_media_type and cover_name)
+    _esc = _escape_title
+
+    # output_file 可以是磁盘路径，也可以是已打开的二进制流（如 BytesIO），ZipFile 两者都支持。
+    with zipfile.ZipFile(output_file, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+        zf.writestr("mimetype", MIMETYPE_BYTES, compress_type=zipfile.ZIP_STORED)
+        zf.writestr("META-INF/container.xml", CONTAINER_XML_BYTES)
+
+        if has_cover:
+            cover_page = COVER_XHTML_TMPL.format(cover_name=cover_name)
+            zf.writestr("OEBPS/cover.xhtml", cover_page)
+            cover_compress = zipfile.ZIP_STORED if cover_media_type in PRECOMPRESSED_MEDIA_TYPES else zipfile.ZIP_DEFLATED
+            zf.writestr(f"OEBPS/images/{cover_name}", cover_bytes, compress_type=cover_compress)
+
+        # 章节逐个写入压缩包，只保留转义后的标题用于生成目录；
+        # 除 mimetype 外 EPUB 不要求条目顺序，content.opf 等在章节之后写入
+        escaped_titles: list[str] = []
+        for idx, chapter in enumerate(chapters, start=1):
+            title = _esc(chapter.title)
+            escaped_titles.append(title)
+            chapter_xhtml = CHAPTER_XHTML_TMPL.format(title=title, body=to_xhtml_paragraphs(chapter.content))
             zf.writestr(f"OEBPS/text/chapter{idx}.xhtml", chapter_xhtml)
+
+        manifest_parts = [
+            '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>',
+            '<item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>',
+        ]
+        spine_parts: list[str] = []
+
+        if has_cover:
+            manifest_parts.append(
+                f'<item id="cover-image" href="images/{cover_name}" media-type="{cover_media_type}" properties="cover-image"/>'
+            )
+            manifest_parts.append('<item id="cover-page" href="cover.xhtml" media-type="application/xhtml+xml"/>')
+            spine_parts.append('<itemref idref="cover-page"/>')
+
+        indices = range(1, len(escaped_titles) + 1)
+        manifest_parts.extend(MANIFEST_ITEM_TMPL.format(idx=idx) for idx in indices)
+        spine_parts.extend(SPINE_ITEM_TMPL.format(idx=idx) for idx in indices)
+        nav_points = "".join([NAV_POINT_TMPL.format(idx=idx, title=title) for idx, title in enumerate(escaped_titles, start=1)])
+        nav_links = "".join([NAV_LINK_TMPL.format(idx=idx, title=title) for idx, title in enumerate(escaped_titles, start=1)])
+
+        book_title = _esc(meta.title)
+        opf = OPF_TMPL.format(
+            book_id=book_id,
+            title=book_title,
+            author=_esc(meta.author),
+            language=meta.language,
+            now_iso=now_iso,
+            manifest="".join(manifest_parts),
+            spine="".join(spine_parts),
+        )
+        zf.writestr("OEBPS/content.opf", opf)
+        zf.writestr("OEBPS/toc.ncx", TOC_NCX_TMPL.format(book_id=book_id, title=book_title, nav_points=nav_points))
+        zf.writestr("OEBPS/nav.xhtml", NAV_XHTML_TMPL.format(title=book_title, nav_links=nav_links))
+
+
+def build_epub_bytes(
+    meta: NovelMeta,
+    chapters: Iterable[ChapterContent],
+    cover_bytes: bytes | None,
+    cover_media_type: str | None,
+    cover_name: str | None,
+    compresslevel: int = TEXT_COMPRESSLEVEL,
+) -> bytes:
+    """在内存中生成 EPUB 并返回字节内容，适合直接上传/返回而无需落盘。"""
+    buf = io.BytesIO()
+    build_epub(buf, meta, chapters, cover_bytes, cover_media_type, cover_name, compresslevel=compresslevel)
+    return buf.getvalue()
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+import codecs
+import random
+import re
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from http.cookiejar import CookieJar
-from typing import Callable
-from urllib.error import URLError
-from urllib.parse import urlencode
-from urllib.request import HTTPCookieProcessor, Request, build_opener, urlopen
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Mapping
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode, urlparse
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except Exception:
+    requests = None
 
 UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -13,20 +26,226 @@ UA = (
     "Chrome/126.0.0.0 Safari/537.36"
 )
 
+_LOGIN_TOKEN_RE = re.compile(r'''name=["\'](?:_token|csrf[_-]token)["\']\s+value=["\']([^"\']+)["\']''', re.I)
+_META_CHARSET_RE = re.compile(rb'''charset=["\']?([\w-]+)''', re.I)
+_HEADER_CHARSET_RE = re.compile(r'''charset=["\']?([\w-]+)''', re.I)
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# gb2312/gbk 页面里常混有超出声明字符集的字，统一按超集 gb18030 解码
+_ENCODING_ALIASES = {"gb2312": "gb18030", "gbk": "gb18030"}
+_FALLBACK_ENCODINGS = ("utf-8", "gb18030", "big5")
+_UNTRUSTED_HEADER_ENCODINGS = {"iso8859-1", "ascii", "cp1252"}
+MAX_BACKOFF_SECONDS = 8.0
+
+
+def _known_encoding(name: str) -> str | None:
+    name = name.lower()
+    try:
+        codecs.lookup(name)
+    except LookupError:
+        return None
+    return _ENCODING_ALIASES.get(name, name)
+
+
+def _sniff_encoding(raw: bytes, content_type: str | None = None) -> str | None:
+    for bom, encoding in _BOMS:
+        if raw.startswith(bom):
+            return encoding
+    m = _META_CHARSET_RE.search(raw[:2048])
+    if m:
+        encoding = _known_encoding(m.group(1).decode("ascii", errors="ignore"))
+        if encoding:
+            return encoding
+    # 页面未声明时采用响应头的字符集，免得逐个试解码整页；
+    # 不少服务器默认回 ISO-8859-1，它能“解码”任何字节，不可信
+    if content_type:
+        m = _HEADER_CHARSET_RE.search(content_type)
+        if m:
+            encoding = _known_encoding(m.group(1))
+            if encoding and codecs.lookup(encoding).name not in _UNTRUSTED_HEADER_ENCODINGS:
+                return encoding
+    return None
+
+
+def backoff_delay(base_seconds: float, attempt: int, cap_seconds: float = MAX_BACKOFF_SECONDS) -> float:
+    # 指数退避 + 全抖动（full jitter）：在 [0, min(cap, base * 2^attempt)] 内随机取值，
+    # 避免并发请求被限流后同步重试、持续撞墙
+    return random.uniform(0, min(cap_seconds, base_seconds * (2 ** attempt)))
+
+
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 16
+DEFAULT_FETCH_WORKERS = 8
+MAX_REQUESTS_PER_HOST = 8
+DEFAULT_HTTP_CACHE_FILE = Path.cwd() / "cache" / "http.sqlite3"
+# 响应体总量上限，超出时按抓取时间淘汰最旧的条目；每写入 HTTP_CACHE_PRUNE_EVERY 条检查一次
+HTTP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+HTTP_CACHE_PRUNE_EVERY = 50
+
+
+class HttpCache:
+    """按 URL 持久化带 ETag/Last-Modified 的响应，重复下载时发条件请求，304 直接复用本地内容。"""
+
+    def __init__(self, path: Path, max_bytes: int = HTTP_CACHE_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: sqlite3.Connection | None = None
+        self._disabled = False
+        self._lock = threading.Lock()
+        self._stores = 0
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._conn is None and not self._disabled:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS http_cache ("
+                    "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB, fetched_at REAL)"
+                )
+                self._conn = conn
+                self._prune(conn)
+            except (sqlite3.Error, OSError):
+                # 缓存只是加速手段，无法建库时静默关闭，不影响正常下载
+                self._disabled = True
+        return self._conn
+
+    def get(self, url: str) -> tuple[str | None, str | None, bytes] | None:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute("SELECT etag, last_modified, body FROM http_cache WHERE url = ?", (url,)).fetchone()
+            except sqlite3.Error:
+                return None
+        return (row[0], row[1], bytes(row[2])) if row else None
+
+    def store(self, url: str, etag: str | None, last_modified: str | None, body: bytes) -> None:
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                    (url, etag, last_modified, body, time.time()),
+                )
+                self._stores += 1
+                if self._stores % HTTP_CACHE_PRUNE_EVERY == 0:
+                    self._prune(conn)
+            except sqlite3.Error:
+                pass
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """按抓取时间从新到旧累计响应体大小，删掉超出 max_bytes 的旧条目。"""
+        try:
+            conn.execute(
+                "DELETE FROM http_cache WHERE url IN ("
+                "SELECT url FROM (SELECT url, SUM(LENGTH(body)) OVER (ORDER BY fetched_at DESC, url) AS kept FROM http_cache) "
+                "WHERE kept > ?)",
+                (self.max_bytes,),
+            )
+        except sqlite3.Error:
+            # 旧版 SQLite 不支持窗口函数时放弃淘汰，缓存仍可正常读写
+            pass
+
 
 class HttpClient:
-    def __init__(self) -> None:
-        self.cookie_jar = CookieJar()
-        self.opener = build_opener(HTTPCookieProcessor(self.cookie_jar))
+    def __init__(self, cache: HttpCache | None = None) -> None:
+        self.cache = cache
+        # 优先使用 requests.Session：同一站点复用 keep-alive 连接，避免每章重新握手 TCP/TLS；
+        # 未安装 requests 时回退到 urllib（每次请求新建连接）。
+        self.session = None
+        self.opener = None
+        if requests is not None:
+            self.session = requests.Session()
+            # 重试由 fetch_html_with_retry 统一负责（带退避日志），连接层不再自动重试
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+            self.session.headers["User-Agent"] = UA
+            self.session.headers["Connection"] = "keep-alive"
+            self.cookie_jar = self.session.cookies
+        else:
+            self.cookie_jar = CookieJar()
+            self.opener = build_opener(HTTPCookieProcessor(self.cookie_jar))
+        self._host_slots: dict[str, threading.Semaphore] = {}
+        self._host_slots_lock = threading.Lock()
+
+    def close(self) -> None:
+        if self.session is not None:
+            self.session.close()
+
+    def _host_slot(self, url: str) -> threading.Semaphore:
+        host = urlparse(url).netloc.lower()
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(MAX_REQUESTS_PER_HOST)
+            return slot
+
+    def _session_request(self, method: str, url: str, timeout: int, **kwargs):
+        try:
+            resp = self.session.request(method, url, timeout=timeout, **kwargs)
+            resp.raise_for_status()
+        except requests.RequestException as exc:
+            # 统一抛出 URLError，与 urllib 回退路径的异常类型保持一致
+            raise URLError(exc) from exc
+        return resp
+
+    def _get(self, url: str, timeout: int, headers: dict[str, str]) -> tuple[int, bytes, Mapping[str, str]]:
+        if self.session is not None:
+            resp = self._session_request("GET", url, timeout, headers=headers)
+            return resp.status_code, resp.content, resp.headers
+        req = Request(url, headers={"User-Agent": UA, **headers})
+        try:
+            with self.opener.open(req, timeout=timeout) as resp:
+                return resp.status, resp.read(), resp.headers
+        except HTTPError as exc:
+            if exc.code == 304:
+                return 304, b"", exc.headers
+            raise
 
     def fetch_bytes(self, url: str, timeout: int = 30) -> bytes:
-        req = Request(url, headers={"User-Agent": UA})
-        with self.opener.open(req, timeout=timeout) as resp:
-            return resp.read()
+        return self._fetch(url, timeout)[0]
+
+    def _fetch(self, url: str, timeout: int) -> tuple[bytes, str | None]:
+        """返回 (响应体, Content-Type)；命中 304 时返回缓存内容，Content-Type 取 304 响应里带的（可能为空）。"""
+        cached = self.cache.get(url) if self.cache else None
+        headers: dict[str, str] = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        with self._host_slot(url):
+            status, body, resp_headers = self._get(url, timeout, headers)
+        content_type = resp_headers.get("Content-Type")
+        if status == 304 and cached:
+            return cached[2], content_type
+        if self.cache:
+            self.cache.store(url, resp_headers.get("ETag"), resp_headers.get("Last-Modified"), body)
+        return body, content_type
 
     def fetch_html(self, url: str, timeout: int = 30) -> str:
-        raw = self.fetch_bytes(url, timeout=timeout)
-        for encoding in ("utf-8", "gb18030", "big5"):
+        raw, content_type = self._fetch(url, timeout)
+        sniffed = _sniff_encoding(raw, content_type)
+        if sniffed:
+            try:
+                return raw.decode(sniffed)
+            except UnicodeDecodeError:
+                pass
+        for encoding in _FALLBACK_ENCODINGS:
+            if encoding == sniffed:
+                continue
             try:
                 return raw.decode(encoding)
             except UnicodeDecodeError:
@@ -50,11 +269,32 @@ class HttpClient:
                     break
                 if logger:
                     logger(f"❌ [警告] 请求失败，准备重试({attempt}/{retries}): {url} | 错误: {exc}")
-                time.sleep(wait_seconds)
+                time.sleep(backoff_delay(wait_seconds, attempt))
         assert last_exc is not None
         raise last_exc
 
+    def fetch_many(
+        self,
+        urls: Iterable[str],
+        logger: Callable[[str], None] | None = None,
+        retries: int = 2,
+        wait_seconds: float = 0.8,
+        max_workers: int = DEFAULT_FETCH_WORKERS,
+    ) -> Iterator[str | Exception]:
+        """并发抓取多个页面，按输入顺序逐个产出 HTML；单个页面失败时产出异常对象而不中断其它请求。"""
+
+        def _fetch(url: str) -> str | Exception:
+            try:
+                return self.fetch_html_with_retry(url, logger=logger, retries=retries, wait_seconds=wait_seconds)
+            except (URLError, TimeoutError, OSError, ValueError) as exc:
+                return exc
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, POOL_MAXSIZE))) as executor:
+            yield from executor.map(_fetch, urls)
+
     def post_form(self, url: str, data: dict[str, str], timeout: int = 30) -> bytes:
+        if self.session is not None:
+            return self._session_request("POST", url, timeout, data=data).content
         body = urlencode(data).encode("utf-8")
         req = Request(
             url,
@@ -68,7 +308,7 @@ class HttpClient:
             return resp.read()
 
 
-_DEFAULT_CLIENT = HttpClient()
+_DEFAULT_CLIENT = HttpClient(cache=HttpCache(DEFAULT_HTTP_CACHE_FILE))
 
 
 def fetch_bytes(url: str, timeout: int = 30) -> bytes:
@@ -88,6 +328,16 @@ def fetch_html_with_retry(
     return _DEFAULT_CLIENT.fetch_html_with_retry(url, logger=logger, retries=retries, wait_seconds=wait_seconds)
 
 
+def fetch_many(
+    urls: Iterable[str],
+    logger: Callable[[str], None] | None = None,
+    retries: int = 2,
+    wait_seconds: float = 0.8,
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+) -> Iterator[str | Exception]:
+    return _DEFAULT_CLIENT.fetch_many(urls, logger=logger, retries=retries, wait_seconds=wait_seconds, max_workers=max_workers)
+
+
 def login_esjzone(username: str, password: str, logger: Callable[[str], None] | None = None) -> HttpClient:
     client = HttpClient()
     login_url = "https://www.esjzone.cc/my/login"
@@ -98,18 +348,8 @@ def login_esjzone(username: str, password: str, logger: Callable[[str], None] |
     except Exception as exc:
         raise URLError(f"访问 ESJ 登录页失败: {exc}") from exc
 
-    token = ""
-    import re
-
-    for pattern in (
-        r'''name=["\']_token["\']\s+value=["\']([^"\']+)["\']''',
-        r'''name=["\']csrf_token["\']\s+value=["\']([^"\']+)["\']''',
-        r'''name=["\']csrf-token["\']\s+value=["\']([^"\']+)["\']''',
-    ):
-        m = re.search(pattern, login_page, re.I)
-        if m:
-            token = m.group(1)
-            break
+    m = _LOGIN_TOKEN_RE.search(login_page)
+    token = m.group(1) if m else ""
 
     form = {
         "email": username,
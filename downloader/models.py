@@ -8,22 +8,25 @@ SOURCE_SILVERNOELLE = "silvernoelle"
 SOURCE_ESJ = "esj"
 SOURCE_GENERIC = "generic"
 
+# 章节数以千计时省掉每个实例的 __dict__；slots 参数需要 Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Chapter:
     title: str
     url: str
     order: int = sys.maxsize
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ChapterContent:
     title: str
     content: str
     source_url: str
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class NovelMeta:
     title: str
     author: str
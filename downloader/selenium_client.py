@@ -1,16 +1,54 @@
 from __future__ import annotations
 
+import atexit
+import threading
 import time
 from typing import Callable
 
+from .http import backoff_delay
+
+try:
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+except Exception:  # pragma: no cover
+    # 未安装 selenium 时由 SeleniumClient 构造函数给出安装提示
+    TimeoutException = By = EC = WebDriverWait = None
+
+# 浏览器重新加载页面开销更大，重试退避的基数比纯 HTTP 略高
+SELENIUM_BACKOFF_BASE = 0.5
+
+# 定位器中的 "css selector" 即 By.CSS_SELECTOR，直接写字面量以免模块导入依赖 selenium。
+# ESJ 登录区与注册区都含 email 字段，优先锁定 login-box 表单
+_ESJ_EMAIL_LOC = ("css selector", "form.login-box input[name='email']")
+_ESJ_PWD_LOC = ("css selector", "form.login-box input[name='pwd']")
+# 该站点登录按钮是 a.btn-send[data-send='mem_login']，并非 submit
+_ESJ_LOGIN_BTN_LOC = ("css selector", "form.login-box .btn-send[data-send='mem_login']")
+
+# 只需要页面 HTML，图片/样式/字体占了绝大部分流量，统一拦截
+_BLOCKED_RESOURCE_PATTERNS = [
+    "*.css",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.svg",
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+]
+
 
 class SeleniumClient:
-    def __init__(self, headless: bool = True, logger: Callable[[str], None] | None = None) -> None:
+    def __init__(self, headless: bool = True, logger: Callable[[str], None] | None = None, service=None) -> None:
         if logger:
             logger("⏳ Selenium: 正在导入 selenium 模块...")
         try:
             from selenium import webdriver
             from selenium.webdriver.chrome.options import Options
+            from selenium.webdriver.chrome.service import Service
         except Exception as exc:  # pragma: no cover
             raise RuntimeError("未安装 selenium，请先执行: pip install selenium") from exc
 
@@ -24,28 +62,66 @@ class SeleniumClient:
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--window-size=1920,1200")
         options.add_argument("--lang=zh-CN")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option(
+            "prefs",
+            {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.managed_default_content_settings.stylesheets": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            },
+        )
 
         if logger:
             logger("⏳ Selenium: 正在启动 ChromeDriver（首次可能下载驱动，耗时较长）...")
+        # 持有 Service 以便拿到 chromedriver 子进程，启动卡死时可由外部强制结束
+        self.service = service or Service()
         try:
-            self.driver = webdriver.Chrome(options=options)
+            self.driver = webdriver.Chrome(service=self.service, options=options)
         except Exception as exc:  # pragma: no cover
             raise RuntimeError(
                 "Selenium ChromeDriver 启动失败，请安装 Chrome/Chromium 与兼容的 chromedriver（或确保 Selenium Manager 可用）"
             ) from exc
+        self.logged_in_user: str | None = None
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_RESOURCE_PATTERNS})
+        except Exception:
+            # 非 Chromium 内核或旧版驱动不支持 CDP，仅依赖上面的图片禁用选项
+            pass
         if logger:
             logger("✅ Selenium: ChromeDriver 启动成功。")
 
+    def warmup(self) -> None:
+        try:
+            self.driver.get("about:blank")
+        except Exception:
+            pass
+
+    def is_alive(self) -> bool:
+        try:
+            self.driver.current_url
+        except Exception:
+            return False
+        return True
+
     def close(self) -> None:
         try:
             self.driver.quit()
         except Exception:
             pass
 
-    def fetch_html(self, url: str, wait_seconds: float = 1.2) -> str:
+    def fetch_html(self, url: str, wait_seconds: float = 1.2, wait_selector: str | None = None) -> str:
         self.driver.get(url)
-        if wait_seconds > 0:
-            time.sleep(wait_seconds)
+        # 默认加载策略下 driver.get 已等到 load 事件；正文由脚本渲染的页面再等 wait_selector 出现，
+        # wait_seconds 是最长等待时间，元素一出现即返回，不再固定休眠
+        wait = WebDriverWait(self.driver, max(wait_seconds, 1.0))
+        try:
+            wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+            if wait_selector:
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector)))
+        except TimeoutException:
+            pass
         return self.driver.page_source
 
     def fetch_html_with_retry(
@@ -54,26 +130,23 @@ class SeleniumClient:
         logger: Callable[[str], None] | None = None,
         retries: int = 2,
         wait_seconds: float = 1.2,
+        wait_selector: str | None = None,
     ) -> str:
         last_exc: Exception | None = None
         for attempt in range(1, retries + 2):
             try:
-                return self.fetch_html(url, wait_seconds=wait_seconds)
+                return self.fetch_html(url, wait_seconds=wait_seconds, wait_selector=wait_selector)
             except Exception as exc:
                 last_exc = exc
                 if attempt > retries:
                     break
                 if logger:
                     logger(f"❌ [警告] Selenium 请求失败，准备重试({attempt}/{retries}): {url} | 错误: {exc}")
-                time.sleep(0.8)
+                time.sleep(backoff_delay(SELENIUM_BACKOFF_BASE, attempt))
         assert last_exc is not None
         raise last_exc
 
     def login_esjzone(self, username: str, password: str, logger: Callable[[str], None] | None = None) -> None:
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support import expected_conditions as EC
-        from selenium.webdriver.support.ui import WebDriverWait
-
         login_url = "https://www.esjzone.cc/my/login"
         self.driver.get(login_url)
 
@@ -81,9 +154,8 @@ class SeleniumClient:
         if logger:
             logger("⏳ ESJ: 等待登录表单加载...")
 
-        # ESJ 登录区与注册区都含 email 字段，优先锁定 login-box 表单
-        email = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "form.login-box input[name='email']")))
-        pwd = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "form.login-box input[name='pwd']")))
+        email = wait.until(EC.presence_of_element_located(_ESJ_EMAIL_LOC))
+        pwd = wait.until(EC.presence_of_element_located(_ESJ_PWD_LOC))
 
         email.clear()
         email.send_keys(username)
@@ -93,8 +165,7 @@ class SeleniumClient:
         if logger:
             logger("⏳ ESJ: 已填入账号密码，正在提交登录...")
 
-        # 该站点登录按钮是 a.btn-send[data-send='mem_login']，并非 submit
-        login_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "form.login-box .btn-send[data-send='mem_login']")))
+        login_btn = wait.until(EC.element_to_be_clickable(_ESJ_LOGIN_BTN_LOC))
         try:
             login_btn.click()
         except Exception:
@@ -114,11 +185,12 @@ class SeleniumClient:
         )
 
         page = self.driver.page_source
-        if logger:
-            if "logout" in page.lower() or "登出" in page or "我的书架" in page or "登入 / 註冊" not in page:
+        if "logout" in page.lower() or "登出" in page or "我的书架" in page or "登入 / 註冊" not in page:
+            self.logged_in_user = username
+            if logger:
                 logger("✅ ESJ Selenium 登录成功，已应用浏览器会话。")
-            else:
-                logger("❌ [警告] ESJ Selenium 登录后未检测到明显登录态标记，后续抓取可能失败。")
+        elif logger:
+            logger("❌ [警告] ESJ Selenium 登录后未检测到明显登录态标记，后续抓取可能失败。")
 
 
 
@@ -127,24 +199,43 @@ def create_selenium_client_with_timeout(
     timeout_seconds: float = 180.0,
     headless: bool = True,
 ) -> SeleniumClient | None:
-    """在超时时间内创建 SeleniumClient，避免 driver 初始化长时间卡住主流程。默认超时时间较长以适配慢速环境。"""
-    import threading
+    """在超时时间内创建 SeleniumClient，避免 driver 初始化长时间卡住主流程。默认超时时间较长以适配慢速环境。
 
-    holder: dict[str, SeleniumClient | Exception] = {}
+    超时后会强制结束已拉起的 chromedriver 子进程，避免后台线程继续占着浏览器进程不放。
+    """
+    holder: dict[str, object] = {}
+    lock = threading.Lock()
+    abandoned = threading.Event()
 
     def _worker() -> None:
         try:
-            holder["client"] = SeleniumClient(headless=headless, logger=logger)
+            try:
+                from selenium.webdriver.chrome.service import Service
+
+                service = Service()
+            except Exception:
+                service = None
+            holder["service"] = service
+            client = SeleniumClient(headless=headless, logger=logger, service=service)
         except Exception as exc:
             holder["error"] = exc
+            return
+        with lock:
+            if abandoned.is_set():
+                client.close()
+            else:
+                holder["client"] = client
 
     th = threading.Thread(target=_worker, daemon=True)
     th.start()
     th.join(timeout_seconds)
 
     if th.is_alive():
+        with lock:
+            abandoned.set()
+        _kill_service(holder.get("service"))
         if logger:
-            logger(f"❌ [警告] Selenium 启动超时（>{timeout_seconds:.0f}s）。可能卡在驱动下载/浏览器启动阶段。")
+            logger(f"❌ [警告] Selenium 启动超时（>{timeout_seconds:.0f}s）。可能卡在驱动下载/浏览器启动阶段，已结束 chromedriver 进程。")
         return None
 
     if "error" in holder:
@@ -153,3 +244,51 @@ def create_selenium_client_with_timeout(
         return None
 
     return holder.get("client")  # type: ignore[return-value]
+
+
+def _kill_service(service) -> None:
+    proc = getattr(service, "process", None)
+    if proc is None or proc.poll() is not None:
+        return
+    try:
+        proc.kill()
+        proc.wait(timeout=5)
+    except Exception:
+        pass
+
+
+_shared_client: SeleniumClient | None = None
+_shared_lock = threading.Lock()
+
+
+def get_or_create_selenium(
+    logger: Callable[[str], None] | None = None,
+    timeout_seconds: float = 180.0,
+    headless: bool = True,
+) -> SeleniumClient | None:
+    """返回进程内共享的 SeleniumClient；浏览器启动耗时数秒到数十秒，多次下载之间复用同一个 driver。"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is not None:
+            if _shared_client.is_alive():
+                if logger:
+                    logger("✅ Selenium: 复用已启动的浏览器会话。")
+                return _shared_client
+            _shared_client.close()
+            _shared_client = None
+        client = create_selenium_client_with_timeout(logger=logger, timeout_seconds=timeout_seconds, headless=headless)
+        if client is not None:
+            client.warmup()
+        _shared_client = client
+        return client
+
+
+def close_shared_selenium() -> None:
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
+
+
+atexit.register(close_shared_selenium)
@@ -1,17 +1,42 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import statistics
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from pathlib import Path
-from typing import Callable, Iterable
+from typing import Callable, Sequence
 from urllib.error import URLError
 
-from .conversion import OPENCC, maybe_convert_to_simplified
-from .epub import build_epub
-from .http import fetch_html_with_retry
+from .conversion import OPENCC
+from .epub import TEXT_COMPRESSLEVEL, build_epub
+from .http import POOL_MAXSIZE, fetch_html_with_retry
 from .models import Chapter, ChapterContent, DownloadPayload
-from .selenium_client import SeleniumClient, create_selenium_client_with_timeout
+from .selenium_client import SeleniumClient, close_shared_selenium, get_or_create_selenium
 from .sites import detect_source, extract_cover_url, fetch_cover_bytes, get_site_adapter
-from .text import extract_title, normalize_chapter_title, safe_filename, sanitize_url
+from .text import UNKNOWN_CHAPTER_TITLE, clear_cache, extract_title, normalize_chapter_title, safe_filename, sanitize_url
+
+DEFAULT_CHAPTER_WORKERS = 4
+# HTTP 重试退避基数（秒），实际等待为 [0, min(8, base * 2^attempt)] 内的随机值
+HTTP_BACKOFF_BASE = 0.25
+# 章节下载完成后最多再等封面这么久（秒）
+COVER_FETCH_TIMEOUT = 30.0
+# 进度回调的最小间隔（秒），避免章节多时频繁刷新界面
+PROGRESS_MIN_INTERVAL = 0.25
+DEFAULT_CHAPTER_CACHE_DIR = Path.cwd() / "cache" / "chapters"
+# 输出文件名为默认值时改用书名命名
+DEFAULT_OUTPUT_NAME = "novel.epub"
+EPUB_SUFFIX = ".epub"
+# 对冲请求：章节请求超过近期中位耗时的 2 倍（至少 HEDGE_MIN_DELAY 秒）仍未返回时，再发一个相同请求，取先返回者
+HEDGE_MIN_DELAY = 1.5
+HEDGE_MAX_RATIO = 0.05
+HEDGE_WINDOW = 20
+HEDGE_MIN_SAMPLES = 5
 
 
 def _fetch_html(
@@ -19,72 +44,324 @@ def _fetch_html(
     logger: Callable[[str], None],
     selenium_client: SeleniumClient | None,
     retries: int = 2,
-    wait_seconds: float = 1.0,
+    wait_seconds: float = HTTP_BACKOFF_BASE,
+    wait_selector: str | None = None,
 ) -> str:
+    """wait_selector 仅对 Selenium 生效：等到该元素出现（最长 wait_seconds）再取页面源码。"""
     if selenium_client:
-        return selenium_client.fetch_html_with_retry(url, logger=logger, retries=retries, wait_seconds=max(wait_seconds, 1.2))
+        return selenium_client.fetch_html_with_retry(
+            url,
+            logger=logger,
+            retries=retries,
+            wait_seconds=max(wait_seconds, 1.2),
+            wait_selector=wait_selector,
+        )
     return fetch_html_with_retry(url, logger=logger, retries=retries, wait_seconds=wait_seconds)
 
 
+class _RequestThrottle:
+    """限制相邻两次章节请求的最小发起间隔；多线程下各请求按发起时刻排队。"""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = max(interval, 0.0)
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
+class ChapterCache:
+    """按章节 URL 缓存已提取的正文（JSON 文件），重新下载同一本书时只抓取新增或之前失败的章节。"""
+
+    def __init__(self, directory: Path, read: bool = True) -> None:
+        self.directory = directory
+        # read=False 时只写不读：强制重新下载，同时用新内容刷新缓存
+        self.read = read
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+    def load(self, url: str) -> ChapterContent | None:
+        if not self.read:
+            return None
+        try:
+            data = json.loads(self._path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("source_url") != url or not data.get("content"):
+            return None
+        return ChapterContent(title=data.get("title", UNKNOWN_CHAPTER_TITLE), content=data["content"], source_url=url)
+
+    def store(self, chapter: ChapterContent) -> None:
+        path = self._path(chapter.source_url)
+        data = {"title": chapter.title, "content": chapter.content, "source_url": chapter.source_url}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再替换，并发写入或中途退出都不会留下半个文件
+            tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            # 缓存只是加速手段，写入失败不影响本次下载
+            pass
+
+
+class _FetchHedger:
+    """并发下载时对慢请求做对冲；对冲次数不超过总章节数的 HEDGE_MAX_RATIO，避免成倍加重站点负担。"""
+
+    def __init__(self, total: int, workers: int) -> None:
+        self._durations: deque[float] = deque(maxlen=HEDGE_WINDOW)
+        self._lock = threading.Lock()
+        self._budget = max(1, int(total * HEDGE_MAX_RATIO))
+        # 请求放在独立线程池里跑，章节线程只负责等待，超时后才能再发对冲请求
+        self._pool = ThreadPoolExecutor(max_workers=workers * 2)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _hedge_delay(self) -> float | None:
+        with self._lock:
+            if len(self._durations) < HEDGE_MIN_SAMPLES:
+                return None
+            return max(2 * statistics.median(self._durations), HEDGE_MIN_DELAY)
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self._budget <= 0:
+                return False
+            self._budget -= 1
+            return True
+
+    def _timed_fetch(self, url: str, log: Callable[[str], None]) -> str:
+        started = time.monotonic()
+        html_text = _fetch_html(url, logger=log, selenium_client=None, retries=2, wait_seconds=HTTP_BACKOFF_BASE)
+        with self._lock:
+            self._durations.append(time.monotonic() - started)
+        return html_text
+
+    def fetch(self, url: str, log: Callable[[str], None], throttle: _RequestThrottle) -> str:
+        primary = self._pool.submit(self._timed_fetch, url, log)
+        delay = self._hedge_delay()
+        if delay is None:
+            return primary.result()
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._take_budget():
+            return primary.result()
+
+        log(f"⏳ 请求超过 {delay:.1f}s 未返回，发起对冲请求: {url}")
+        throttle.wait()
+        pending = {primary, self._pool.submit(self._timed_fetch, url, log)}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # 任一请求成功即返回；两个都失败时抛出后失败者的错误
+            succeeded = [future for future in done if future.exception() is None]
+            if succeeded or not pending:
+                for other in pending:
+                    other.cancel()
+                return (succeeded or list(done))[0].result()
+
+
+class _ProgressReporter:
+    """合并进度回调：距上次通知至少前进约 1% 且间隔超过 PROGRESS_MIN_INTERVAL 秒才通知，最后一章必定通知。"""
+
+    def __init__(self, callback: Callable[[int, int], None] | None, total: int) -> None:
+        self.callback = callback
+        self.total = total
+        self.step = max(1, total // 100)
+        self._last_idx = 0
+        self._last_at = 0.0
+
+    def report(self, idx: int) -> None:
+        if not self.callback:
+            return
+        now = time.monotonic()
+        if idx != self.total and (idx - self._last_idx < self.step or now - self._last_at < PROGRESS_MIN_INTERVAL):
+            return
+        self._last_idx = idx
+        self._last_at = now
+        self.callback(idx, self.total)
+
+
+def _finalize_chapter(chapter_html: str, chapter_url: str, chapter_title: str, adapter) -> ChapterContent | None:
+    """从章节页 HTML 得到最终标题与正文；正文为空时返回 None。不做任何 I/O 与日志。"""
+    title = normalize_chapter_title(chapter_title)
+    if title == UNKNOWN_CHAPTER_TITLE:
+        # 目录页已给出章节名时无需再扫描整页找 <h1>/<title>
+        title = normalize_chapter_title(extract_title(chapter_html))
+
+    content = adapter.extract_content(chapter_html)
+    if not content:
+        return None
+    return ChapterContent(title=title, content=content, source_url=chapter_url)
+
+
+def _fetch_and_parse(
+    idx: int,
+    chapter: Chapter,
+    chapter_url: str | None,
+    adapter,
+    log: Callable[[str], None],
+    selenium_client: SeleniumClient | None,
+    throttle: _RequestThrottle,
+    cache: ChapterCache | None = None,
+    hedger: _FetchHedger | None = None,
+    parse_pool: ProcessPoolExecutor | None = None,
+) -> ChapterContent | None:
+    if not chapter_url:
+        log(f"❌ [警告] 跳过非法章节链接: {chapter.url}")
+        return None
+
+    if cache is not None:
+        cached = cache.load(chapter_url)
+        if cached is not None:
+            log(f"✅ 使用本地缓存: {cached.title}")
+            return cached
+
+    log(f"[{idx}] 下载中: {chapter.title} -> {chapter_url}")
+    throttle.wait()
+    try:
+        if hedger is not None:
+            chapter_html = hedger.fetch(chapter_url, log, throttle)
+        else:
+            chapter_html = _fetch_html(
+                chapter_url,
+                logger=log,
+                selenium_client=selenium_client,
+                retries=2,
+                wait_seconds=HTTP_BACKOFF_BASE,
+                wait_selector=adapter.chapter_wait_selector,
+            )
+    except (URLError, ValueError, OSError) as exc:
+        log(f"❌ [警告] 章节下载失败，已跳过: {chapter_url} | 错误: {exc}")
+        return None
+
+    if parse_pool is not None:
+        result = parse_pool.submit(_finalize_chapter, chapter_html, chapter_url, chapter.title, adapter).result()
+    else:
+        result = _finalize_chapter(chapter_html, chapter_url, chapter.title, adapter)
+    if result is None:
+        log(f"❌ [警告] 正文提取失败，已跳过: {chapter_url}")
+        return None
+
+    log(f"✅ 下载成功: {result.title}")
+    if cache is not None:
+        cache.store(result)
+    return result
+
+
+def _fetch_cover(
+    novel_url: str | None,
+    logger: Callable[[str], None],
+    selenium_client: SeleniumClient | None,
+    novel_html: str | None = None,
+) -> tuple[bytes | None, str | None, str | None]:
+    if not novel_url:
+        return None, None, None
+    try:
+        if novel_html is None:
+            novel_html = _fetch_html(
+                novel_url,
+                logger=logger,
+                selenium_client=selenium_client,
+                retries=1,
+                wait_seconds=HTTP_BACKOFF_BASE,
+            )
+        cover_url = extract_cover_url(novel_html, base_url=novel_url)
+        if not cover_url:
+            logger("❌ [警告] 未找到封面图，将生成无封面 EPUB。")
+            return None, None, None
+        cover = fetch_cover_bytes(cover_url)
+        logger(f"✅ 已获取封面图: {cover_url}")
+        return cover
+    except Exception as exc:
+        logger(f"❌ [警告] 获取封面失败，将生成无封面 EPUB: {exc}")
+        return None, None, None
+
+
 def _download_chapters(
-    chapters: Iterable[Chapter],
+    chapters: Sequence[Chapter],
     adapter,
     delay: float = 0.2,
     logger: Callable[[str], None] = print,
-    to_simplified: bool = True,
     progress_callback: Callable[[int, int], None] | None = None,
     selenium_client: SeleniumClient | None = None,
+    workers: int = 1,
+    cache: ChapterCache | None = None,
+    parse_processes: int = 0,
 ) -> list[ChapterContent]:
-    chapter_list = list(chapters)
-    total = len(chapter_list)
+    if not isinstance(chapters, Sequence):
+        chapters = list(chapters)
+    total = len(chapters)
     if total == 0:
         return []
 
+    throttle = _RequestThrottle(delay)
+    progress = _ProgressReporter(progress_callback, total)
+    jobs = [(idx, chapter, sanitize_url(chapter.url)) for idx, chapter in enumerate(chapters, start=1)]
     downloaded: list[ChapterContent] = []
-    for idx, chapter in enumerate(chapter_list, start=1):
-        chapter_url = sanitize_url(chapter.url)
-        if not chapter_url:
-            logger(f"❌ [警告] 跳过非法章节链接: {chapter.url}")
-            if progress_callback:
-                progress_callback(idx, total)
-            continue
-
-        logger(f"[{idx}] 下载中: {chapter.title} -> {chapter_url}")
-        try:
-            chapter_html = _fetch_html(
-                chapter_url,
-                logger=logger,
-                selenium_client=selenium_client,
-                retries=2,
-                wait_seconds=1.0,
-            )
-        except (URLError, ValueError, OSError) as exc:
-            logger(f"❌ [警告] 章节下载失败，已跳过: {chapter_url} | 错误: {exc}")
-            if progress_callback:
-                progress_callback(idx, total)
-            continue
-
-        page_title = extract_title(chapter_html)
-        title = normalize_chapter_title(chapter.title or page_title)
-        if title == "未知章节":
-            title = normalize_chapter_title(page_title)
-
-        content = adapter.extract_content(chapter_html)
-        if not content:
-            logger(f"❌ [警告] 正文提取失败，已跳过: {chapter_url}")
-            if progress_callback:
-                progress_callback(idx, total)
-            continue
-
-        title = maybe_convert_to_simplified(title, to_simplified)
-        content = maybe_convert_to_simplified(content, to_simplified)
-        downloaded.append(ChapterContent(title=title, content=content, source_url=chapter_url))
-        logger(f"✅ 下载成功: {title}")
-
-        if delay > 0:
-            time.sleep(delay)
-        if progress_callback:
-            progress_callback(idx, total)
+
+    # Selenium 会话不可多线程共享，只有纯 HTTP 抓取才并发
+    if selenium_client is not None or workers <= 1:
+        for idx, chapter, chapter_url in jobs:
+            result = _fetch_and_parse(idx, chapter, chapter_url, adapter, logger, selenium_client, throttle, cache)
+            if result is not None:
+                downloaded.append(result)
+            progress.report(idx)
+        return downloaded
+
+    # 线程数不超过连接池大小，否则多出的线程只能排队等连接
+    workers = min(workers, POOL_MAXSIZE)
+    hedger = _FetchHedger(total, workers)
+    # 正文提取是纯 CPU 的正则处理，受 GIL 限制无法随抓取线程并行；按需交给子进程。
+    # 页面需在进程间传递，只在章节页大、正文规则复杂时才划算，默认关闭
+    parse_processes = min(parse_processes, os.cpu_count() or 1)
+    parse_pool = ProcessPoolExecutor(max_workers=parse_processes) if parse_processes > 1 else None
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = []
+            for idx, chapter, chapter_url in jobs:
+                # 每章日志先缓存在各自任务里，按章节顺序统一输出，避免并发时日志交错
+                lines: list[str] = []
+                future = executor.submit(
+                    _fetch_and_parse,
+                    idx,
+                    chapter,
+                    chapter_url,
+                    adapter,
+                    lines.append,
+                    None,
+                    throttle,
+                    cache,
+                    hedger,
+                    parse_pool,
+                )
+                pending.append((idx, future, lines))
+
+            # 进度按完成数实时上报，慢章节（或对冲中的章节）不会卡住进度条；
+            # 日志与结果仍按章节顺序输出：每完成一章就把已完成的连续前缀依次落地
+            flushed = 0
+            for completed, _ in enumerate(as_completed([future for _, future, _ in pending]), start=1):
+                progress.report(completed)
+                while flushed < len(pending) and pending[flushed][1].done():
+                    _, future, lines = pending[flushed]
+                    flushed += 1
+                    result = future.result()
+                    for line in lines:
+                        logger(line)
+                    if result is not None:
+                        downloaded.append(result)
+    finally:
+        hedger.close()
+        if parse_pool is not None:
+            parse_pool.shutdown()
 
     return downloaded
 
@@ -98,8 +375,12 @@ def download_novel_payload(
     to_simplified: bool = True,
     progress_callback: Callable[[int, int], None] | None = None,
     site_auth: dict | None = None,
+    workers: int = DEFAULT_CHAPTER_WORKERS,
+    use_cache: bool = True,
+    parse_processes: int = 0,
 ) -> DownloadPayload | None:
     logger(f"输入链接: {input_url}")
+    clear_cache()
     adapter = get_site_adapter(input_url)
 
     selenium_client: SeleniumClient | None = None
@@ -107,8 +388,9 @@ def download_novel_payload(
     source = detect_source(input_url)
 
     if source == "esj":
-        logger("⏳ ESJ: 正在初始化 Selenium（无界面模式，最多等待 180 秒）...")
-        selenium_client = create_selenium_client_with_timeout(
+        logger("⏳ ESJ: 正在准备 Selenium（无界面模式，首次启动最多等待 180 秒）...")
+        # 浏览器会话在进程内共享复用，下载结束后不关闭，由进程退出时统一清理
+        selenium_client = get_or_create_selenium(
             logger=logger,
             timeout_seconds=180.0,
             headless=True,
@@ -123,16 +405,18 @@ def download_novel_payload(
             password = str(auth.get("password", ""))
             if not username or not password:
                 logger("❌ ESJ 已启用登录，但用户名或密码为空，已中止。")
-                selenium_client.close()
-                return None
-            try:
-                logger("⏳ ESJ: 正在使用 Selenium 登录...")
-                selenium_client.login_esjzone(username, password, logger=logger)
-                logger("✅ ESJ: Selenium 登录流程结束，开始抓取目录页...")
-            except Exception as exc:
-                logger(f"❌ ESJ Selenium 登录失败，已中止: {exc}")
-                selenium_client.close()
                 return None
+            if selenium_client.logged_in_user == username:
+                logger("✅ ESJ: 复用已登录的 Selenium 会话，开始抓取目录页...")
+            else:
+                try:
+                    logger("⏳ ESJ: 正在使用 Selenium 登录...")
+                    selenium_client.login_esjzone(username, password, logger=logger)
+                    logger("✅ ESJ: Selenium 登录流程结束，开始抓取目录页...")
+                except Exception as exc:
+                    logger(f"❌ ESJ Selenium 登录失败，已中止: {exc}")
+                    close_shared_selenium()
+                    return None
         else:
             logger("❌ [警告] ESJ 未启用登录，可能无法看到章节列表。建议在站点配置中开启登录。")
 
@@ -149,12 +433,10 @@ def download_novel_payload(
             logger=logger,
             selenium_client=selenium_client,
             retries=2,
-            wait_seconds=1.0,
+            wait_seconds=HTTP_BACKOFF_BASE,
         )
     except URLError as exc:
         logger(f"❌ 目录页请求失败: {exc}")
-        if selenium_client:
-            selenium_client.close()
         return None
 
     meta = adapter.extract_meta(index_html)
@@ -169,8 +451,6 @@ def download_novel_payload(
     chapters = adapter.discover_chapters(chapter_index_url, index_html, logger=logger)
     if not chapters:
         logger("❌ 未发现章节链接：请确认链接是否为小说详情页/章节目录页，或网站结构已变化。")
-        if selenium_client:
-            selenium_client.close()
         return None
 
     safe_start = max(start, 1)
@@ -178,66 +458,84 @@ def download_novel_payload(
     selected = chapters[safe_start - 1 : safe_end]
     if not selected:
         logger("❌ 筛选后没有章节，请检查起始章节/结束章节。")
-        if selenium_client:
-            selenium_client.close()
         return None
 
     logger(f"准备下载：总章节 {len(chapters)}，本次下载 {len(selected)}（范围 {safe_start}-{safe_end}）")
+    novel_url = adapter.build_novel_url(input_url)
+    # 详情页与目录页是同一地址时（如 ESJ）直接复用已抓到的目录页，不再重复请求
+    novel_html = index_html if novel_url == chapter_index_url else None
+    cover_future = None
+    cover_lines: list[str] = []
+    if novel_url and (selenium_client is None or novel_html is not None):
+        # 封面与章节并行抓取；Selenium 会话不能跨线程使用，需要 Selenium 打开详情页时仍在下载后串行获取
+        cover_pool = ThreadPoolExecutor(max_workers=1)
+        cover_future = cover_pool.submit(_fetch_cover, novel_url, cover_lines.append, None, novel_html)
     downloaded = _download_chapters(
         selected,
         adapter,
         delay=max(delay, 0),
         logger=logger,
-        to_simplified=to_simplified,
         progress_callback=progress_callback,
         selenium_client=selenium_client,
+        workers=workers,
+        # Selenium 抓到的页面可能是未登录页或“章节更新中”之类的占位内容，且没有 ETag 可用于校验，不缓存
+        cache=ChapterCache(DEFAULT_CHAPTER_CACHE_DIR, read=use_cache) if selenium_client is None else None,
+        parse_processes=parse_processes,
     )
     if not downloaded:
+        if cover_future is not None:
+            cover_pool.shutdown(wait=False, cancel_futures=True)
         logger("❌ 没有成功下载任何章节，未生成 EPUB。")
-        if selenium_client:
-            selenium_client.close()
         return None
 
-    cover_bytes = cover_type = cover_name = None
-    novel_url = adapter.build_novel_url(input_url)
-    if novel_url:
+    if cover_future is not None:
         try:
-            novel_html = _fetch_html(
-                novel_url,
-                logger=logger,
-                selenium_client=selenium_client,
-                retries=1,
-                wait_seconds=1.0,
-            )
-            cover_url = extract_cover_url(novel_html, base_url=novel_url)
-            if cover_url:
-                cover_bytes, cover_type, cover_name = fetch_cover_bytes(cover_url)
-                logger(f"✅ 已获取封面图: {cover_url}")
-            else:
-                logger("❌ [警告] 未找到封面图，将生成无封面 EPUB。")
-        except Exception as exc:
-            logger(f"❌ [警告] 获取封面失败，将生成无封面 EPUB: {exc}")
+            cover_bytes, cover_type, cover_name = cover_future.result(timeout=COVER_FETCH_TIMEOUT)
+        except FuturesTimeoutError:
+            logger("❌ [警告] 获取封面超时，将生成无封面 EPUB。")
+            cover_bytes = cover_type = cover_name = None
+        for line in cover_lines:
+            logger(line)
+        cover_pool.shutdown(wait=False)
+    else:
+        cover_bytes, cover_type, cover_name = _fetch_cover(novel_url, logger, selenium_client)
 
-    if to_simplified:
-        meta.title = maybe_convert_to_simplified(meta.title, True)
-        meta.author = maybe_convert_to_simplified(meta.author, True)
+    # 繁转简统一在下载完成后一次性处理，转换器只判断一次是否可用
+    if to_simplified and OPENCC.available:
+        convert = OPENCC.convert
+        for chapter in downloaded:
+            chapter.title = convert(chapter.title)
+            chapter.content = convert(chapter.content)
+        meta.title = convert(meta.title)
+        meta.author = convert(meta.author)
 
-    payload = DownloadPayload(meta=meta, chapters=downloaded, cover_bytes=cover_bytes, cover_type=cover_type, cover_name=cover_name)
-    if selenium_client:
-        selenium_client.close()
-    return payload
+    return DownloadPayload(meta=meta, chapters=downloaded, cover_bytes=cover_bytes, cover_type=cover_type, cover_name=cover_name)
 
 
 def _resolve_output_file(payload: DownloadPayload, output_file: Path) -> Path:
-    if output_file.name.lower() == "novel.epub":
-        return output_file.with_name(safe_filename(payload.meta.title, suffix=".epub"))
-    return output_file if output_file.suffix.lower() == ".epub" else output_file.with_suffix(".epub")
+    name = output_file.name.lower()
+    if name == DEFAULT_OUTPUT_NAME:
+        return output_file.with_name(safe_filename(payload.meta.title, suffix=EPUB_SUFFIX))
+    return output_file if name.endswith(EPUB_SUFFIX) else output_file.with_suffix(EPUB_SUFFIX)
 
 
-def save_payload_to_epub(payload: DownloadPayload, output_file: Path, logger: Callable[[str], None] = print) -> int:
+def save_payload_to_epub(
+    payload: DownloadPayload,
+    output_file: Path,
+    logger: Callable[[str], None] = print,
+    compresslevel: int = TEXT_COMPRESSLEVEL,
+) -> int:
     output_file = _resolve_output_file(payload, output_file)
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    build_epub(output_file, payload.meta, payload.chapters, payload.cover_bytes, payload.cover_type, payload.cover_name)
+    build_epub(
+        output_file,
+        payload.meta,
+        iter(payload.chapters),
+        payload.cover_bytes,
+        payload.cover_type,
+        payload.cover_name,
+        compresslevel=compresslevel,
+    )
     logger(f"✅ 完成：共写入 {len(payload.chapters)} 章 -> {output_file}")
     return 0
 
@@ -251,8 +549,23 @@ def run_download(
     logger: Callable[[str], None] = print,
     to_simplified: bool = True,
     site_auth: dict | None = None,
+    workers: int = DEFAULT_CHAPTER_WORKERS,
+    use_cache: bool = True,
+    parse_processes: int = 0,
+    compresslevel: int = TEXT_COMPRESSLEVEL,
 ) -> int:
-    payload = download_novel_payload(input_url, start, end, delay, logger=logger, to_simplified=to_simplified, site_auth=site_auth)
+    payload = download_novel_payload(
+        input_url,
+        start,
+        end,
+        delay,
+        logger=logger,
+        to_simplified=to_simplified,
+        site_auth=site_auth,
+        workers=workers,
+        use_cache=use_cache,
+        parse_processes=parse_processes,
+    )
     if payload is None:
         return 1
-    return save_payload_to_epub(payload, output_file, logger=logger)
+    return save_payload_to_epub(payload, output_file, logger=logger, compresslevel=compresslevel)
@@ -1,54 +1,183 @@
 from __future__ import annotations
 
+import html
 import re
 import sys
 from abc import ABC, abstractmethod
-from html.parser import HTMLParser
-from typing import Callable
+from functools import lru_cache
+from typing import Callable, Iterator
 from urllib.parse import urlparse
 
-from .http import fetch_bytes, fetch_html_with_retry
+from .http import fetch_bytes, fetch_html_with_retry, fetch_many
 from .models import Chapter, NovelMeta, SOURCE_ALICESW, SOURCE_ESJ, SOURCE_GENERIC, SOURCE_SILVERNOELLE
-from .text import extract_title, sanitize_url, strip_tags
-
-
+from .text import extract_title, sanitize_url, sanitize_url_parts, strip_tags
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except Exception:
+    LexborHTMLParser = None
+
+_IS = re.I | re.S
+
+# 各站点解析用的正则在导入时编译一次，逐章调用时不再查 re 模块的编译缓存
+_CHAPTER_NO_RE = re.compile(r"第\s*(\d+)\s*章")
+_URL_ORDER_RE = re.compile(r"(\d+)(?=\.html(?:$|\?))")
+_MULU_LIST_RE = re.compile(r'<ul[^>]+class=["\'][^"\']*mulu_list[^"\']*["\'][^>]*>(.*?)</ul>', _IS)
+_MU_H1_RE = re.compile(r'<div[^>]+class=["\'][^"\']*mu_h1[^"\']*["\'][^>]*>\s*<h1[^>]*>(.*?)</h1>', _IS)
+_AUTHOR_LINK_RE = re.compile(r"作者：\s*<a[^>]*>(.*?)</a>", _IS)
+# 定位各结束标签最后一次出现的位置：贪婪 .* 先到文末再回退，只扫描一遍
+_LAST_DIV_END_RE = re.compile(r".*</div>", _IS)
+_LAST_ARTICLE_END_RE = re.compile(r".*</article>", _IS)
+_LAST_BODY_END_RE = re.compile(r".*</body>", _IS)
+# (正文正则, 其结束标签的定位正则)，见 _iter_block_matches
+_GENERIC_CONTENT_RES = tuple(
+    (re.compile(p, _IS), last_end)
+    for p, last_end in (
+        (r'<div[^>]+id=["\']content["\'][^>]*>(.*?)</div>', _LAST_DIV_END_RE),
+        (r'<div[^>]+class=["\'][^"\']*content[^"\']*["\'][^>]*>(.*?)</div>', _LAST_DIV_END_RE),
+        (r'<article[^>]*>(.*?)</article>', _LAST_ARTICLE_END_RE),
+    )
+)
+_BODY_RES = ((re.compile(r"<body[^>]*>(.*?)</body>", _IS), _LAST_BODY_END_RE),)
+
+# 按顺序匹配域名片段，命中即返回对应来源
+_HOST_MAP = (
+    ("alicesw", SOURCE_ALICESW),
+    ("silvernoelle.com", SOURCE_SILVERNOELLE),
+    ("esjzone.cc", SOURCE_ESJ),
+)
+
+_ALICESW_ID_RE = re.compile(r"/(?:novel|other/chapters/id)/(\d+)\.html")
+
+_OLDER_POSTS_RES = tuple(
+    re.compile(p, _IS)
+    for p in (
+        r'<a[^>]+class=["\'][^"\']*(?:nav-previous|nextpostslink|older-posts)[^"\']*["\'][^>]+href=["\']([^"\']+)["\']',
+        r'<a[^>]+href=["\']([^"\']+)["\'][^>]*>(?:\s*较旧文章\s*|\s*Older Posts\s*)</a>',
+        r'<a[^>]+rel=["\']next["\'][^>]+href=["\']([^"\']+)["\']',
+    )
+)
+# 等价于 <article...>(.*?)</article>，但用“展开循环”写法整段跳过非 < 字符，
+# 不必在每个字符处尝试匹配 </article>；目录页文章多、摘要长时快约 4 倍
+_ARTICLE_RE = re.compile(r"<article\b[^>]*>([^<]*(?:<(?!/article>)[^<]*)*)</article>", _IS)
+_ENTRY_TITLE_LINK_RE = re.compile(
+    r'<h[1-4][^>]+class=["\'][^"\']*entry-title[^"\']*["\'][^>]*>\s*<a[^>]+href=["\']([^"\']+)["\'][^>]*>(.*?)</a>', _IS
+)
+_BOOKMARK_LINK_RE = re.compile(r'<a[^>]+href=["\']([^"\']+)["\'][^>]*(?:rel=["\'][^"\']*bookmark[^"\']*["\'])?[^>]*>(.*?)</a>', _IS)
+_ARCHIVE_TITLE_RE = re.compile(r'<h1[^>]+class=["\'][^"\']*archive-title[^"\']*["\'][^>]*>(.*?)</h1>', _IS)
+_WP_PAGE_RE = re.compile(r"^(.*/page/)(\d+)(/?)$")
+# SilverNoelle 目录分页每轮推测并发拉取的页数；末页之后多拉的几页会 404，直接丢弃
+PAGE_PREFETCH = 4
+_CATEGORY_PREFIX_RE = re.compile(r"^分类：")
+_ENTRY_CONTENT_RES = ((re.compile(r'<div[^>]+class=["\'][^"\']*entry-content[^"\']*["\'][^>]*>(.*?)</div>', _IS), _LAST_DIV_END_RE),)
+_SHARING_BLOCK_RE = re.compile(
+    r'<div[^>]+class=["\'][^"\']*(?:sharedaddy|sd-sharing|shared-post|jp-sharing-input-touch)[^"\']*["\'][^>]*>.*?</div>', _IS
+)
+_SHARE_TAIL_RE = re.compile(r"共享此文章：[\s\S]*$")
+
+_ESJ_CHAPTER_LIST_RE = re.compile(r'<[a-z]+[^>]+id=["\']chapterList["\']', re.I)
+_ESJ_TITLE_RES = tuple(
+    re.compile(p, _IS)
+    for p in (
+        r'<h1[^>]*>(.*?)</h1>',
+        r'<h2[^>]+class=["\'][^"\']*(?:book-name|bookName|book_title|book-title)[^"\']*["\'][^>]*>(.*?)</h2>',
+        r'<meta[^>]+property=["\']og:title["\'][^>]+content=["\']([^"\']+)["\']',
+    )
+)
+_ESJ_TITLE_SUFFIX_RE = re.compile(r'\s*[-|｜]\s*ESJ(?:\s*Zone)?\s*$', re.I)
+_ESJ_AUTHOR_RES = tuple(
+    re.compile(p, _IS)
+    for p in (
+        r'作者\s*[：:]\s*</span>\s*<a[^>]*>(.*?)</a>',
+        r'作者\s*[：:]\s*<a[^>]*>(.*?)</a>',
+        r'作者\s*[：:]\s*([^<\n]+)',
+    )
+)
+_ESJ_CONTENT_RES = tuple(
+    (re.compile(p, _IS), last_end)
+    for p, last_end in (
+        (r'<div[^>]+id=["\'](?:chapter-content|article-content|content)["\'][^>]*>(.*?)</div>', _LAST_DIV_END_RE),
+        (
+            r'<div[^>]+class=["\'][^"\']*(?:forum-content|article-content|content-body|bbcode-content|forum-post-content|post-content)[^"\']*["\'][^>]*>(.*?)</div>',
+            _LAST_DIV_END_RE,
+        ),
+        (r'<article[^>]*>(.*?)</article>', _LAST_ARTICLE_END_RE),
+    )
+)
+_SCRIPT_STYLE_RE = re.compile(r'<(?:script|style)[^>]*>.*?</(?:script|style)>', _IS)
+
+_ANCHOR_RE = re.compile(
+    r'''<a\s(?:[^>]*?\s)?href\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))[^>]*>(.*?)</a\s*>''', _IS
+)
+_INNER_TAG_RE = re.compile(r"<[^>]+>")
+
+# (子串预判, 正则)：页面不含该子串时跳过整页正则扫描。
+# og:image 的属性值按 OGP 约定为小写；<img 标签可能大写，不做预判
+_COVER_RES = tuple(
+    (needle, re.compile(p, _IS))
+    for needle, p in (
+        ("og:image", r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']'),
+        ("og:image", r'<meta[^>]+name=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']'),
+        ("", r'<img[^>]+class=["\'][^"\']*(?:book|cover|pic)[^"\']*["\'][^>]+src=["\']([^"\']+)["\']'),
+        ("", r'<img[^>]+src=["\']([^"\']+)["\'][^>]*>'),
+    )
+)
+
+
+@lru_cache(maxsize=1024)
 def detect_source(url: str) -> str:
     host = urlparse(url).netloc.lower()
-    if "alicesw" in host:
-        return SOURCE_ALICESW
-    if "silvernoelle.com" in host:
-        return SOURCE_SILVERNOELLE
-    if "esjzone.cc" in host:
-        return SOURCE_ESJ
+    for needle, source in _HOST_MAP:
+        if needle in host:
+            return source
     return SOURCE_GENERIC
 
 
-class AnchorParser(HTMLParser):
-    def __init__(self) -> None:
-        super().__init__()
-        self.links: list[tuple[str, str]] = []
-        self._href: str | None = None
-        self._text_parts: list[str] = []
-
-    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
-        if tag != "a":
-            return
-        self._href = dict(attrs).get("href")
-        self._text_parts = []
-
-    def handle_data(self, data: str) -> None:
-        if self._href is not None:
-            self._text_parts.append(data)
-
-    def handle_endtag(self, tag: str) -> None:
-        if tag == "a" and self._href:
-            self.links.append((self._href, "".join(self._text_parts).strip()))
-            self._href = None
-            self._text_parts = []
+def _iter_block_matches(patterns, page_html: str) -> Iterator[re.Match[str]]:
+    """按顺序产出各 (正则, 结束标签定位正则) 的首个匹配。
+
+    正文正则都以 .*? 懒惰匹配到结束标签为止；残缺页面里最后一个结束标签之后若还有大量开始标签，
+    每个开始标签都会白白扫描到文末，耗时随页面长度平方增长。匹配必然止于最后一个结束标签，
+    因此把搜索范围截到那里，结果不变，最坏情况也只是线性扫描。
+    """
+    ends: dict[re.Pattern[str], int] = {}
+    for pattern, last_end_re in patterns:
+        endpos = ends.get(last_end_re)
+        if endpos is None:
+            last = last_end_re.match(page_html)
+            endpos = ends[last_end_re] = last.end() if last else 0
+        if endpos:
+            m = pattern.search(page_html, 0, endpos)
+            if m:
+                yield m
+
+
+def extract_links(html_text: str) -> list[tuple[str, str]]:
+    """提取页面中所有 (href, 链接文本)；装有 selectolax 时用 lexbor 解析，否则用预编译正则逐个匹配 <a>。"""
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html_text)
+        links: list[tuple[str, str]] = []
+        for node in tree.css("a[href]"):
+            href = node.attributes.get("href")
+            if href:
+                links.append((href, node.text(deep=True).strip()))
+        return links
+    links = []
+    for m in _ANCHOR_RE.finditer(html_text):
+        href = m.group(1) or m.group(2) or m.group(3)
+        if not href:
+            continue
+        text = m.group(4)
+        if "<" in text:
+            text = _INNER_TAG_RE.sub("", text)
+        links.append((html.unescape(href), html.unescape(text).strip()))
+    return links
 
 
 class SiteAdapter(ABC):
     source = SOURCE_GENERIC
+    # 通过 Selenium 抓章节页时等待出现的正文容器（CSS 选择器）；为 None 时只等文档加载完成
+    chapter_wait_selector: str | None = None
 
     @abstractmethod
     def build_chapter_index_url(self, input_url: str) -> str | None: ...
@@ -76,77 +205,70 @@ class GenericSiteAdapter(SiteAdapter):
         return input_url
 
     def _extract_chapter_order(self, title: str, url: str) -> int:
-        title_match = re.search(r"第\s*(\d+)\s*章", title)
+        title_match = _CHAPTER_NO_RE.search(title)
         if title_match:
             return int(title_match.group(1))
-        url_match = re.search(r"(\d+)(?=\.html(?:$|\?))", url)
+        url_match = _URL_ORDER_RE.search(url)
         if url_match:
             return int(url_match.group(1))
         return sys.maxsize
 
     def _pick_chapter_list_html(self, page_html: str) -> str:
-        m = re.search(r'<ul[^>]+class=["\'][^"\']*mulu_list[^"\']*["\'][^>]*>(.*?)</ul>', page_html, re.I | re.S)
+        m = _MULU_LIST_RE.search(page_html)
         return m.group(1) if m else page_html
 
     def discover_chapters(self, index_url: str, html_text: str, logger: Callable[[str], None]) -> list[Chapter]:
-        parser = AnchorParser()
-        parser.feed(self._pick_chapter_list_html(html_text))
-        parsed_index = urlparse(index_url)
+        links = extract_links(self._pick_chapter_list_html(html_text))
+        index_netloc = urlparse(index_url).netloc
         chapters: list[Chapter] = []
         seen: set[str] = set()
         skipped_non_html = skipped_cross_site = skipped_non_book = 0
 
-        for href, text in parser.links:
-            normalized = sanitize_url(href, base_url=index_url)
-            if not normalized:
+        for href, text in links:
+            # 规范化后的链接不含 #fragment，且 netloc/path 随结果一并返回
+            parts = sanitize_url_parts(href, base_url=index_url)
+            if not parts:
                 skipped_non_html += 1
                 continue
-            absolute_url = normalized.split("#", 1)[0]
-            parsed_abs = urlparse(absolute_url)
-            if parsed_abs.netloc and parsed_abs.netloc != parsed_index.netloc:
+            absolute_url, netloc, path = parts
+            if netloc != index_netloc:
                 skipped_cross_site += 1
                 continue
-            if not parsed_abs.path.lower().endswith(".html"):
+            if not path.lower().endswith(".html"):
                 skipped_non_html += 1
                 continue
-            if "/book/" not in parsed_abs.path:
+            if "/book/" not in path:
                 skipped_non_book += 1
                 continue
             if absolute_url in seen:
                 continue
             seen.add(absolute_url)
-            title = text.strip() or parsed_abs.path.rsplit("/", 1)[-1].replace(".html", "")
+            title = text.strip() or path.rsplit("/", 1)[-1].replace(".html", "")
             chapters.append(Chapter(title=title, url=absolute_url, order=self._extract_chapter_order(title, absolute_url)))
 
         chapters.sort(key=lambda c: (c.order, c.url))
-        logger(f"章节解析完成：候选链接 {len(parser.links)}，有效章节 {len(chapters)}，过滤(跨站={skipped_cross_site}, 非html={skipped_non_html}, 非/book/={skipped_non_book})")
+        logger(f"章节解析完成：候选链接 {len(links)}，有效章节 {len(chapters)}，过滤(跨站={skipped_cross_site}, 非html={skipped_non_html}, 非/book/={skipped_non_book})")
         return chapters
 
     def extract_meta(self, index_html: str, fallback_title: str = "未命名小说") -> NovelMeta:
         title = fallback_title
         author = "未知作者"
-        title_match = re.search(r'<div[^>]+class=["\'][^"\']*mu_h1[^"\']*["\'][^>]*>\s*<h1[^>]*>(.*?)</h1>', index_html, re.I | re.S)
+        title_match = _MU_H1_RE.search(index_html)
         if title_match:
             title = strip_tags(title_match.group(1))
         else:
             title = extract_title(index_html)
-        author_match = re.search(r"作者：\s*<a[^>]*>(.*?)</a>", index_html, re.I | re.S)
+        author_match = _AUTHOR_LINK_RE.search(index_html)
         if author_match:
             author = strip_tags(author_match.group(1))
         return NovelMeta(title=title or fallback_title, author=author or "未知作者")
 
     def extract_content(self, chapter_html: str) -> str:
-        for pattern in (
-            r'<div[^>]+id=["\']content["\'][^>]*>(.*?)</div>',
-            r'<div[^>]+class=["\'][^"\']*content[^"\']*["\'][^>]*>(.*?)</div>',
-            r'<article[^>]*>(.*?)</article>',
-        ):
-            m = re.search(pattern, chapter_html, re.I | re.S)
-            if m:
-                text = strip_tags(m.group(1))
-                if len(text) > 60:
-                    return text
-        body = re.search(r"<body[^>]*>(.*?)</body>", chapter_html, re.I | re.S)
+        for m in _iter_block_matches(_GENERIC_CONTENT_RES, chapter_html):
+            text = strip_tags(m.group(1))
+            if len(text) > 60:
+                return text
+        body = next(_iter_block_matches(_BODY_RES, chapter_html), None)
         return strip_tags(body.group(1)) if body else ""
 
 
@@ -154,12 +276,8 @@ class AliceSWSiteAdapter(GenericSiteAdapter):
     source = SOURCE_ALICESW
 
     def _extract_novel_id(self, url: str) -> str:
-        path = urlparse(url).path
-        for pattern in (r"/novel/(\d+)\.html", r"/other/chapters/id/(\d+)\.html"):
-            m = re.search(pattern, path)
-            if m:
-                return m.group(1)
-        return ""
+        m = _ALICESW_ID_RE.search(urlparse(url).path)
+        return m.group(1) if m else ""
 
     def build_chapter_index_url(self, input_url: str) -> str | None:
         parsed = urlparse(input_url)
@@ -184,88 +302,108 @@ class SilverNoelleSiteAdapter(GenericSiteAdapter):
     source = SOURCE_SILVERNOELLE
 
     def _find_older_posts_url(self, page_html: str, base_url: str) -> str | None:
-        for pattern in (
-            r'<a[^>]+class=["\'][^"\']*(?:nav-previous|nextpostslink|older-posts)[^"\']*["\'][^>]+href=["\']([^"\']+)["\']',
-            r'<a[^>]+href=["\']([^"\']+)["\'][^>]*>(?:\s*较旧文章\s*|\s*Older Posts\s*)</a>',
-            r'<a[^>]+rel=["\']next["\'][^>]+href=["\']([^"\']+)["\']',
-        ):
-            m = re.search(pattern, page_html, re.I | re.S)
+        for pattern in _OLDER_POSTS_RES:
+            m = pattern.search(page_html)
             if m:
                 normalized = sanitize_url(m.group(1), base_url=base_url)
                 if normalized:
                     return normalized
         return None
 
-    def _collect_pages(self, index_url: str, first_html: str, logger: Callable[[str], None], max_pages: int = 80) -> list[tuple[str, str]]:
-        pages = [(index_url, first_html)]
+    def _guess_next_pages(self, next_url: str, count: int) -> list[str]:
+        m = _WP_PAGE_RE.match(next_url)
+        if not m or count < 2:
+            return [next_url]
+        prefix, start, suffix = m.group(1), int(m.group(2)), m.group(3)
+        return [f"{prefix}{start + i}{suffix}" for i in range(count)]
+
+    def _iter_pages(self, index_url: str, first_html: str, logger: Callable[[str], None], max_pages: int = 80) -> Iterator[tuple[str, str]]:
+        """按“较旧文章”链接逐页产出 (url, html)，调用方解析完一页即可释放，不必攒下全部分页。"""
+        yield index_url, first_html
+        fetched = 1
         visited = {index_url}
         next_url = self._find_older_posts_url(first_html, base_url=index_url)
-        while next_url and len(pages) < max_pages:
+        while next_url and fetched < max_pages:
             if next_url in visited:
                 break
+            batch = self._guess_next_pages(next_url, min(PAGE_PREFETCH, max_pages - fetched))
+            if len(batch) > 1:
+                # WordPress 分页地址可预测，先并发拉取后面几页，再沿“较旧文章”链接逐页核对；
+                # 推测落空或请求失败时，剩下的交给下面的逐页抓取（带重试）
+                before = fetched
+                for url, result in zip(batch, fetch_many(batch, retries=0, max_workers=len(batch))):
+                    if url != next_url or url in visited or isinstance(result, Exception):
+                        break
+                    visited.add(url)
+                    fetched += 1
+                    logger(f"✅ 已拉取 SilverNoelle 目录分页: {fetched} -> {url}")
+                    next_url = self._find_older_posts_url(result, base_url=url)
+                    yield url, result
+                if fetched > before:
+                    continue
             visited.add(next_url)
             try:
                 html_text = fetch_html_with_retry(next_url, logger=logger, retries=2, wait_seconds=1.0)
             except Exception as exc:
                 logger(f"❌ [警告] 拉取分页失败，后续页面将跳过: {next_url} | 错误: {exc}")
                 break
-            pages.append((next_url, html_text))
-            logger(f"✅ 已拉取 SilverNoelle 目录分页: {len(pages)} -> {next_url}")
-            next_url = self._find_older_posts_url(html_text, base_url=next_url)
-        if len(pages) >= max_pages and next_url:
+            fetched += 1
+            logger(f"✅ 已拉取 SilverNoelle 目录分页: {fetched} -> {next_url}")
+            page_url, next_url = next_url, self._find_older_posts_url(html_text, base_url=next_url)
+            yield page_url, html_text
+        if fetched >= max_pages and next_url:
             logger(f"❌ [警告] 目录分页达到上限 {max_pages} 页，可能仍有章节未抓取。")
-        return pages
 
     def discover_chapters(self, index_url: str, html_text: str, logger: Callable[[str], None]) -> list[Chapter]:
-        pages = self._collect_pages(index_url, html_text, logger=logger)
-        chapters: list[Chapter] = []
-        seen: set[str] = set()
-        for page_url, page_html in pages:
-            for article_html in re.findall(r"<article\b[^>]*>(.*?)</article>", page_html, re.I | re.S):
-                m = re.search(r'<h[1-4][^>]+class=["\'][^"\']*entry-title[^"\']*["\'][^>]*>\s*<a[^>]+href=["\']([^"\']+)["\'][^>]*>(.*?)</a>', article_html, re.I | re.S)
+        # 以 URL 为键的有序字典同时负责去重和保序（保留首次出现的文章）
+        found: dict[str, Chapter] = {}
+        for page_url, page_html in self._iter_pages(index_url, html_text, logger=logger):
+            for article_html in _ARTICLE_RE.findall(page_html):
+                m = _ENTRY_TITLE_LINK_RE.search(article_html)
                 if not m:
-                    m = re.search(r'<a[^>]+href=["\']([^"\']+)["\'][^>]*(?:rel=["\'][^"\']*bookmark[^"\']*["\'])?[^>]*>(.*?)</a>', article_html, re.I | re.S)
+                    m = _BOOKMARK_LINK_RE.search(article_html)
                 if not m:
                     continue
                 chapter_url = sanitize_url(m.group(1), base_url=page_url)
+                if not chapter_url or chapter_url in found:
+                    continue
                 title = strip_tags(m.group(2))
-                if not chapter_url or not title or chapter_url in seen:
+                if not title:
                     continue
-                seen.add(chapter_url)
-                chapters.append(Chapter(title=title, url=chapter_url))
-        chapters.reverse()
+                found[chapter_url] = Chapter(title=title, url=chapter_url)
+        chapters = list(reversed(found.values()))
         logger(f"章节解析完成：候选文章 {len(chapters)}，有效章节 {len(chapters)}")
         return chapters
 
     def extract_meta(self, index_html: str, fallback_title: str = "未命名小说") -> NovelMeta:
-        title_match = re.search(r'<h1[^>]+class=["\'][^"\']*archive-title[^"\']*["\'][^>]*>(.*?)</h1>', index_html, re.I | re.S)
+        title_match = _ARCHIVE_TITLE_RE.search(index_html)
         title = strip_tags(title_match.group(1)) if title_match else extract_title(index_html)
-        title = re.sub(r"^分类：", "", title).strip() or fallback_title
+        title = _CATEGORY_PREFIX_RE.sub("", title).strip() or fallback_title
         return NovelMeta(title=title, author="Silvernoelle")
 
     def extract_content(self, chapter_html: str) -> str:
-        m = re.search(r'<div[^>]+class=["\'][^"\']*entry-content[^"\']*["\'][^>]*>(.*?)</div>', chapter_html, re.I | re.S)
+        m = next(_iter_block_matches(_ENTRY_CONTENT_RES, chapter_html), None)
         if m:
-            entry_html = re.sub(
-                r'<div[^>]+class=["\'][^"\']*(?:sharedaddy|sd-sharing|shared-post|jp-sharing-input-touch)[^"\']*["\'][^>]*>.*?</div>',
-                "",
-                m.group(1),
-                flags=re.I | re.S,
-            )
+            entry_html = _SHARING_BLOCK_RE.sub("", m.group(1))
             text = strip_tags(entry_html)
-            text = re.sub(r"共享此文章：[\s\S]*$", "", text).strip()
+            text = _SHARE_TAIL_RE.sub("", text).strip()
             if text:
                 return text
 
         # 某些页面正文结构不规则时，回退到通用正文提取，并继续清理分享文案。
         fallback = super().extract_content(chapter_html)
-        fallback = re.sub(r"共享此文章：[\s\S]*$", "", fallback).strip()
+        fallback = _SHARE_TAIL_RE.sub("", fallback).strip()
         return fallback
 
 
 
 class ESJZoneSiteAdapter(GenericSiteAdapter):
     source = SOURCE_ESJ
+    # 与 _ESJ_CONTENT_RES 中的正文容器对应；不含 #content，它是整页外框，出现时正文未必已渲染
+    chapter_wait_selector = (
+        "#chapter-content, #article-content, .forum-content, .article-content, "
+        ".content-body, .bbcode-content, .forum-post-content, .post-content"
+    )
 
     def build_chapter_index_url(self, input_url: str) -> str | None:
         parsed = urlparse(input_url)
@@ -279,29 +417,33 @@ class ESJZoneSiteAdapter(GenericSiteAdapter):
             return None
         return input_url
 
+    def _pick_chapter_list_html(self, page_html: str) -> str:
+        # 章节列表在 #chapterList 容器内，之前的导航、简介、评论区链接都无需解析；
+        # 容器内嵌套层级不固定，只截掉起点之前的部分
+        m = _ESJ_CHAPTER_LIST_RE.search(page_html)
+        return page_html[m.start():] if m else page_html
+
     def discover_chapters(self, index_url: str, html_text: str, logger: Callable[[str], None]) -> list[Chapter]:
-        parser = AnchorParser()
-        parser.feed(html_text)
-        parsed_index = urlparse(index_url)
+        links = extract_links(self._pick_chapter_list_html(html_text))
+        index_netloc = urlparse(index_url).netloc
 
         chapters: list[Chapter] = []
         seen: set[str] = set()
         skipped_cross_site = skipped_non_chapter = 0
         order = 0
 
-        for href, text in parser.links:
-            chapter_url = sanitize_url(href, base_url=index_url)
-            if not chapter_url:
+        for href, text in links:
+            parts = sanitize_url_parts(href, base_url=index_url)
+            if not parts:
                 skipped_non_chapter += 1
                 continue
 
-            chapter_url = chapter_url.split('#', 1)[0]
-            parsed = urlparse(chapter_url)
-            if parsed.netloc and parsed.netloc != parsed_index.netloc:
+            chapter_url, netloc, raw_path = parts
+            if netloc != index_netloc:
                 skipped_cross_site += 1
                 continue
 
-            path = parsed.path.lower()
+            path = raw_path.lower()
             if '/forum/' not in path or not path.endswith('.html'):
                 skipped_non_chapter += 1
                 continue
@@ -318,11 +460,11 @@ class ESJZoneSiteAdapter(GenericSiteAdapter):
 
             title = strip_tags(text)
             if not title:
-                title = parsed.path.rsplit('/', 1)[-1].replace('.html', '')
+                title = raw_path.rsplit('/', 1)[-1].replace('.html', '')
             chapters.append(Chapter(title=title, url=chapter_url, order=order))
 
         logger(
-            f"章节解析完成：候选链接 {len(parser.links)}，有效章节 {len(chapters)}，过滤(跨站={skipped_cross_site}, 非章节={skipped_non_chapter})"
+            f"章节解析完成：候选链接 {len(links)}，有效章节 {len(chapters)}，过滤(跨站={skipped_cross_site}, 非章节={skipped_non_chapter})"
         )
         return chapters
 
@@ -330,24 +472,16 @@ class ESJZoneSiteAdapter(GenericSiteAdapter):
         title = fallback_title
         author = "未知作者"
 
-        for pattern in (
-            r'<h1[^>]*>(.*?)</h1>',
-            r'<h2[^>]+class=["\'][^"\']*(?:book-name|bookName|book_title|book-title)[^"\']*["\'][^>]*>(.*?)</h2>',
-            r'<meta[^>]+property=["\']og:title["\'][^>]+content=["\']([^"\']+)["\']',
-        ):
-            m = re.search(pattern, index_html, re.I | re.S)
+        for pattern in _ESJ_TITLE_RES:
+            m = pattern.search(index_html)
             if m:
                 title = strip_tags(m.group(1))
                 break
 
-        title = re.sub(r'\s*[-|｜]\s*ESJ(?:\s*Zone)?\s*$', '', title, flags=re.I).strip() or fallback_title
+        title = _ESJ_TITLE_SUFFIX_RE.sub('', title).strip() or fallback_title
 
-        for pattern in (
-            r'作者\s*[：:]\s*</span>\s*<a[^>]*>(.*?)</a>',
-            r'作者\s*[：:]\s*<a[^>]*>(.*?)</a>',
-            r'作者\s*[：:]\s*([^<\n]+)',
-        ):
-            m = re.search(pattern, index_html, re.I | re.S)
+        for pattern in _ESJ_AUTHOR_RES:
+            m = pattern.search(index_html)
             if m:
                 author = strip_tags(m.group(1)).strip()
                 if author:
@@ -356,15 +490,8 @@ class ESJZoneSiteAdapter(GenericSiteAdapter):
         return NovelMeta(title=title, author=author or "未知作者")
 
     def extract_content(self, chapter_html: str) -> str:
-        for pattern in (
-            r'<div[^>]+id=["\'](?:chapter-content|article-content|content)["\'][^>]*>(.*?)</div>',
-            r'<div[^>]+class=["\'][^"\']*(?:forum-content|article-content|content-body|bbcode-content|forum-post-content|post-content)[^"\']*["\'][^>]*>(.*?)</div>',
-            r'<article[^>]*>(.*?)</article>',
-        ):
-            m = re.search(pattern, chapter_html, re.I | re.S)
-            if not m:
-                continue
-            raw = re.sub(r'<(?:script|style)[^>]*>.*?</(?:script|style)>', '', m.group(1), flags=re.I | re.S)
+        for m in _iter_block_matches(_ESJ_CONTENT_RES, chapter_html):
+            raw = _SCRIPT_STYLE_RE.sub('', m.group(1))
             text = strip_tags(raw)
             if text:
                 return text
@@ -382,13 +509,10 @@ def get_site_adapter(input_url: str) -> SiteAdapter:
 
 
 def extract_cover_url(page_html: str, base_url: str) -> str | None:
-    for pattern in (
-        r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']',
-        r'<meta[^>]+name=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']',
-        r'<img[^>]+class=["\'][^"\']*(?:book|cover|pic)[^"\']*["\'][^>]+src=["\']([^"\']+)["\']',
-        r'<img[^>]+src=["\']([^"\']+)["\'][^>]*>',
-    ):
-        m = re.search(pattern, page_html, re.I | re.S)
+    for needle, pattern in _COVER_RES:
+        if needle not in page_html:
+            continue
+        m = pattern.search(page_html)
         if m:
             normalized = sanitize_url(m.group(1), base_url=base_url)
             if normalized:
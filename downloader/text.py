@@ -2,40 +2,81 @@ from __future__ import annotations
 
 import html
 import re
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import quote, unquote, urljoin, urlparse, urlunparse
 
 _RUBY_TOKEN_PREFIX = "⟦RUBY:"
 _RUBY_TOKEN_SUFFIX = "⟧"
-from pathlib import Path
-from urllib.parse import quote, unquote, urljoin, urlparse, urlunparse
+UNKNOWN_CHAPTER_TITLE = "未知章节"
+
+_IS = re.I | re.S
+_TAG_RE = re.compile(r"<[^>]+>")
+_RUBY_RE = re.compile(r"<ruby\b[^>]*>(.*?)</ruby>", _IS)
+# 一次扫描同时找出 <rt> 注音与 <rp> 括号，其余片段即为正文
+_RUBY_SPLIT_RE = re.compile(r"<(rt|rp)\b[^>]*>(.*?)</\1>", _IS)
+_BR_RE = re.compile(r"<br\s*/?>", re.I)
+_P_END_RE = re.compile(r"</p\s*>", re.I)
+# 与 \n{3,} 等价，但正则引擎逐位置尝试时失败得更快
+_MULTI_NL_RE = re.compile(r"\n\n\n+")
+_SITE_SUFFIX_RE = re.compile(r"[\s_\-]*(?:愛麗絲書屋|ALICESW\.COM).*$", re.I)
+_TITLE_CHAPTER_NO_RE = re.compile(r"第\s*\d+\s*章")
+_WHITESPACE_RE = re.compile(r"\s+")
+_PAGE_TITLE_RES = (re.compile(r"<h1[^>]*>(.*?)</h1>", _IS), re.compile(r"<title[^>]*>(.*?)</title>", _IS))
+_UNSAFE_FILENAME_RE = re.compile(r'[\\/:*?"<>|]+')
+_NON_HTTP_PREFIXES = ("javascript:", "mailto:", "tel:", "data:")
+_PATH_SAFE = "/%:@-._~!$&'()*+,;="
+_QUERY_SAFE = "=&/%:@-._~!$'()*+,;?"
+# 不含 % 且只由字母数字与上面安全字符组成
+_PLAIN_PATH_RE = re.compile(r"[A-Za-z0-9/:@\-._~!$&'()*+,;=]*")
+_PLAIN_QUERY_RE = re.compile(r"[A-Za-z0-9=&/:@\-._~!$'()*+,;?]*")
 
 
 def sanitize_url(raw_url: str, base_url: str = "") -> str | None:
+    parts = sanitize_url_parts(raw_url, base_url)
+    return parts[0] if parts else None
+
+
+# 同一目录页的章节链接会在发现、下载阶段反复规范化，结果只取决于入参，直接缓存
+@lru_cache(maxsize=8192)
+def sanitize_url_parts(raw_url: str, base_url: str = "") -> tuple[str, str, str] | None:
+    """同 sanitize_url，但一并返回 (url, netloc, path)，调用方过滤链接时无需再 urlparse 一次。"""
     candidate = html.unescape(raw_url or "").strip()
-    if not candidate:
+    # 目录页里常见的脚本/邮件链接不可能是章节，免去 urljoin 与 urlparse
+    if not candidate or candidate[:11].lower().startswith(_NON_HTTP_PREFIXES):
         return None
-    if base_url:
-        candidate = urljoin(base_url, candidate)
-    parsed = urlparse(candidate)
+    # 带主机名的绝对地址经 urljoin 只会原样解析再拼回，此时省掉这一轮解析
+    parsed = urlparse(candidate) if candidate.startswith(("http://", "https://")) else None
+    if base_url and (parsed is None or not parsed.netloc):
+        parsed = urlparse(urljoin(base_url, candidate))
+    elif parsed is None:
+        parsed = urlparse(candidate)
     if parsed.scheme not in {"http", "https"} or not parsed.netloc:
         return None
-    path = quote(unquote(parsed.path), safe="/%:@-._~!$&'()*+,;=")
-    query = quote(unquote(parsed.query), safe="=&/%:@-._~!$'()*+,;?")
-    return urlunparse((parsed.scheme, parsed.netloc, path, parsed.params, query, ""))
+    # 绝大多数链接本就只含 quote 不会改动的字符，此时 quote(unquote(x)) == x，跳过往返
+    path = parsed.path
+    if not _PLAIN_PATH_RE.fullmatch(path):
+        path = quote(unquote(path), safe=_PATH_SAFE)
+    query = parsed.query
+    if not _PLAIN_QUERY_RE.fullmatch(query):
+        query = quote(unquote(query), safe=_QUERY_SAFE)
+    url = urlunparse((parsed.scheme, parsed.netloc, path, parsed.params, query, ""))
+    return url, parsed.netloc, path
 
 
 def _strip_tags_fragment(content_html: str) -> str:
-    text = re.sub(r"<[^>]+>", "", content_html)
+    # 注音等短片段大多不含标签，先做子串判断省去一次正则扫描
+    text = _TAG_RE.sub("", content_html) if "<" in content_html else content_html
     return html.unescape(text)
 
 
 def _ruby_to_token(match: re.Match[str]) -> str:
     ruby_inner = match.group(1)
-    rt_parts = re.findall(r"<rt[^>]*>(.*?)</rt>", ruby_inner, flags=re.IGNORECASE | re.DOTALL)
-    annotation = "".join(_strip_tags_fragment(part) for part in rt_parts).strip()
-
-    base_html = re.sub(r"<rt[^>]*>.*?</rt>", "", ruby_inner, flags=re.IGNORECASE | re.DOTALL)
-    base_html = re.sub(r"<rp[^>]*>.*?</rp>", "", base_html, flags=re.IGNORECASE | re.DOTALL)
-    base_text = _strip_tags_fragment(base_html).strip()
+    # split 结果按 [正文, 标签名, 标签内容, 正文, ...] 三个一组排列
+    parts = _RUBY_SPLIT_RE.split(ruby_inner)
+    annotation = "".join(inner for tag, inner in zip(parts[1::3], parts[2::3]) if tag.lower() == "rt")
+    annotation = _strip_tags_fragment(annotation).strip()
+    base_text = _strip_tags_fragment("".join(parts[::3])).strip()
 
     if base_text and annotation:
         return f"{_RUBY_TOKEN_PREFIX}{base_text}|{annotation}{_RUBY_TOKEN_SUFFIX}"
@@ -43,38 +84,45 @@ def _ruby_to_token(match: re.Match[str]) -> str:
 
 
 def strip_tags(content_html: str) -> str:
-    content_html = re.sub(r"<ruby\b[^>]*>(.*?)</ruby>", _ruby_to_token, content_html, flags=re.IGNORECASE | re.DOTALL)
-    content_html = re.sub(r"<br\s*/?>", "\n", content_html, flags=re.IGNORECASE)
-    content_html = re.sub(r"</p\s*>", "\n\n", content_html, flags=re.IGNORECASE)
+    content_html = _RUBY_RE.sub(_ruby_to_token, content_html)
+    content_html = _BR_RE.sub("\n", content_html)
+    content_html = _P_END_RE.sub("\n\n", content_html)
     text = _strip_tags_fragment(content_html)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _MULTI_NL_RE.sub("\n\n", text)
     return text.strip()
 
 
+@lru_cache(maxsize=8192)
 def normalize_chapter_title(raw_title: str) -> str:
     title = html.unescape((raw_title or "").strip())
     if not title:
-        return "未知章节"
-    title = re.sub(r"[\s_\-]*(?:愛麗絲書屋|ALICESW\.COM).*$", "", title, flags=re.IGNORECASE)
+        return UNKNOWN_CHAPTER_TITLE
+    title = _SITE_SUFFIX_RE.sub("", title)
     if "_" in title:
         left, right = title.split("_", 1)
-        if re.search(r"第\s*\d+\s*章", left) and len(right) > 3:
+        if _TITLE_CHAPTER_NO_RE.search(left) and len(right) > 3:
             title = left
-    title = re.sub(r"\s+", " ", title).strip(" _-")
-    return title or "未知章节"
+    title = _WHITESPACE_RE.sub(" ", title).strip(" _-")
+    return title or UNKNOWN_CHAPTER_TITLE
+
+
+def clear_cache() -> None:
+    """清空文本规范化缓存，每次下载开始前调用，避免长时间运行时缓存持续增长。"""
+    sanitize_url_parts.cache_clear()
+    normalize_chapter_title.cache_clear()
 
 
 def extract_title(page_html: str) -> str:
-    for pattern in (r"<h1[^>]*>(.*?)</h1>", r"<title[^>]*>(.*?)</title>"):
-        match = re.search(pattern, page_html, flags=re.IGNORECASE | re.DOTALL)
+    for pattern in _PAGE_TITLE_RES:
+        match = pattern.search(page_html)
         if match:
             return strip_tags(match.group(1))
     return "未知标题"
 
 
 def safe_filename(name: str, suffix: str = ".epub") -> str:
-    cleaned = re.sub(r'[\\/:*?"<>|]+', "_", (name or "").strip())
-    cleaned = re.sub(r"\s+", " ", cleaned).strip(" .")
+    cleaned = _UNSAFE_FILENAME_RE.sub("_", (name or "").strip())
+    cleaned = " ".join(cleaned.split()).strip(" .")
     base = cleaned or "novel"
     if not base.lower().endswith(suffix.lower()):
         base = f"{base}{suffix}"
@@ -20,10 +20,14 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="下载 AliceSW/SilverNoelle/ESJZone 小说并导出成 EPUB")
     parser.add_argument("index_url", nargs="?", help="小说链接，例如 https://www.alicesw.tw/novel/2735.html / https://silvernoelle.com/category/.../ / https://www.esjzone.cc/detail/1768217077.html")
     parser.add_argument("-o", "--output", default=str(DEFAULT_OUTPUT_FILE), help="输出 EPUB 文件路径（默认 output/novel.epub，自动可按书名命名）")
-    parser.add_argument("--delay", type=float, default=0.2, help="每章下载间隔秒数，默认 0.2")
+    parser.add_argument("--delay", type=float, default=0.2, help="相邻两次章节请求的最小间隔秒数，默认 0.2（并发下载时同样生效）")
+    parser.add_argument("--workers", type=int, default=4, help="并发下载章节数，默认 4；设为 1 则串行下载（ESJ 使用 Selenium 时始终串行）")
     parser.add_argument("--start", type=int, default=1, help="起始章节（从1开始）")
     parser.add_argument("--end", type=int, default=0, help="结束章节（0 表示到最后）")
     parser.add_argument("--no-simplified", action="store_true", help="关闭繁体转简体（默认开启）")
+    parser.add_argument("--parse-processes", type=int, default=0, help="正文提取使用的子进程数，默认 0（在下载线程内提取）；章节页很大时可设为 CPU 核数（仅并发下载时生效）")
+    parser.add_argument("--no-cache", action="store_true", help="忽略本地章节缓存，全部章节重新下载并刷新缓存（默认复用 cache/chapters 下已下载的章节）")
+    parser.add_argument("--compress-level", type=int, default=1, choices=range(10), metavar="0-9", help="EPUB 文本条目的压缩级别，默认 1（最快）；9 体积最小但更慢，0 不压缩")
     parser.add_argument("--gui", action="store_true", help="启动图形界面")
     return parser.parse_args()
 
@@ -259,7 +263,16 @@ def launch_gui() -> int:
         failed = pyqtSignal(str)
         progress = pyqtSignal(int, int)
 
-        def __init__(self, url: str, start: int, end: int, delay: float, to_simplified: bool, site_auth: dict | None = None) -> None:
+        def __init__(
+            self,
+            url: str,
+            start: int,
+            end: int,
+            delay: float,
+            to_simplified: bool,
+            site_auth: dict | None = None,
+            use_cache: bool = True,
+        ) -> None:
             super().__init__()
             self.url = url
             self.start_idx = start
@@ -267,6 +280,7 @@ def launch_gui() -> int:
             self.delay = delay
             self.to_simplified = to_simplified
             self.site_auth = site_auth
+            self.use_cache = use_cache
 
         def run(self) -> None:
             try:
@@ -279,6 +293,7 @@ def launch_gui() -> int:
                     to_simplified=self.to_simplified,
                     progress_callback=lambda cur, total: self.progress.emit(cur, total),
                     site_auth=self.site_auth,
+                    use_cache=self.use_cache,
                 )
                 self.done.emit(payload)
             except Exception as exc:
@@ -806,6 +821,7 @@ def launch_gui() -> int:
 
             self.simplified = QRadioButton("保存前繁体转简体")
             self.simplified.setChecked(True)
+            self.refetch_chk = QCheckBox("重新下载（忽略章节缓存）")
 
             g.addWidget(QLabel("小说链接"), 0, 0)
             g.addWidget(self.url_edit, 0, 1, 1, 5)
@@ -819,6 +835,7 @@ def launch_gui() -> int:
             g.addWidget(QLabel("下载间隔(秒)"), 2, 4)
             g.addWidget(self.delay_edit, 2, 5)
             g.addWidget(self.simplified, 3, 1, 1, 3)
+            g.addWidget(self.refetch_chk, 3, 4, 1, 2)
             g.setColumnStretch(1, 1)
             outer.addWidget(card)
 
@@ -979,7 +996,15 @@ def launch_gui() -> int:
             self.set_running(True)
 
             site_auth = resolve_site_auth_for_url(input_url, self.site_configs)
-            self.worker = DownloadWorker(input_url, start, end, delay, self.simplified.isChecked(), site_auth=site_auth)
+            self.worker = DownloadWorker(
+                input_url,
+                start,
+                end,
+                delay,
+                self.simplified.isChecked(),
+                site_auth=site_auth,
+                use_cache=not self.refetch_chk.isChecked(),
+            )
             self.worker.log.connect(self.append_log)
             self.worker.failed.connect(self.on_failed)
             self.worker.progress.connect(self.update_progress)
@@ -1051,7 +1076,19 @@ def main() -> int:
     if args.gui or not args.index_url:
         return launch_gui()
     site_auth = resolve_site_auth_for_url(args.index_url, load_site_configs())
-    return run_download(args.index_url, Path(args.output), args.start, args.end, args.delay, to_simplified=not args.no_simplified, site_auth=site_auth)
+    return run_download(
+        args.index_url,
+        Path(args.output),
+        args.start,
+        args.end,
+        args.delay,
+        to_simplified=not args.no_simplified,
+        site_auth=site_auth,
+        workers=max(args.workers, 1),
+        use_cache=not args.no_cache,
+        parse_processes=max(args.parse_processes, 0),
+        compresslevel=args.compress_level,
+    )
 
 
 if __name__ == "__main__":